@@ -1,32 +1,65 @@
 import cv2
-import math
 import time
 import os
 import datetime
 import pytz
 import sqlite3
-from flask import Flask, render_template, Response, request, jsonify, send_from_directory, send_file
-from ultralytics import YOLO
-import numpy as np
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-import io
-import face_recognition
+from flask import Flask, render_template, Response, request, jsonify, send_from_directory, abort
+import json
+import threading
+from streaming import FrameBroadcaster
+from capture import CameraGrabber
+from inference import InferenceStage, InferenceExecutor, PIPELINES, DEFAULT_PIPELINE
+from camera_registry import load_camera_registry, open_camera_source, is_live_source
+from tracker import PersonTracker, ASSIGNMENT_METHODS
+from posture import analyze_postures
+from persistence import DatabaseWriter, create_rollups
+from response_cache import ResponseCache
+from events import EventBus
+from exporter import EXPORT_TABLES, parse_date_range, stream_csv, stream_xlsx
+from history import HISTORY_TABLES, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, query_page
+from overlay import OverlayCompositor, text_size
+from snapshots import SnapshotWriter, SNAPSHOT_FORMATS
+from capture_store import CaptureStore, CAPTURE_CACHE_SECONDS
+from face_index import FaceGallery
+from face_store import FaceEncodingStore
+from face_tracking import TrackIdentifier, UNKNOWN
+from face_workers import FaceWorkerPool
+from preprocess import FramePreprocessor, FACE_CROP_SIZE, LOW_LIGHT_AUTO
+from motion import MotionGate
+from scheduler import FrameScheduler, LEVELS, DETECTION_LEVELS, LEVEL_FULL, LEVEL_TRACK, LEVEL_RENDER
 
 app = Flask(__name__)
 
 # Configuration
 CAPTURE_FOLDER = 'static/captures'
+THUMBNAIL_FOLDER = os.path.join(CAPTURE_FOLDER, 'thumbs')
 FACES_FOLDER = 'faces'
+FACE_CACHE_FILE = os.environ.get('FACE_CACHE_FILE', 'face_encodings.npz')
+FACE_WORKERS = int(os.environ.get('FACE_WORKERS', '1'))
 DATABASE_FILE = 'visionguard.db'
+CAMERAS_CONFIG = os.environ.get('CAMERAS_CONFIG', 'cameras.json')
+DASHBOARD_CACHE_TTL = 2.0  # seconds between rebuilds of the shared dashboard stats
+LIVE_STATS_INTERVAL = 0.5  # seconds between pushed live stats updates
 os.makedirs(CAPTURE_FOLDER, exist_ok=True)
+os.makedirs(THUMBNAIL_FOLDER, exist_ok=True)
 os.makedirs(FACES_FOLDER, exist_ok=True)
 
+# Face detection/encoding (head crops and enrolment photos) runs in worker
+# processes. They are forked here, before any other thread is started. The
+# pool's own helper threads start right after the fork, so this must remain
+# the only fork-based pool.
+face_workers = FaceWorkerPool(workers=FACE_WORKERS, slot_shape=(FACE_CROP_SIZE, FACE_CROP_SIZE, 3))
+face_workers.start()
+
 # Initialize Database
 def init_db():
     conn = sqlite3.connect(DATABASE_FILE)
     cursor = conn.cursor()
     
+    # WAL lets dashboard reads run while the background writer commits
+    cursor.execute('PRAGMA journal_mode=WAL')
+    
     # Phone alerts table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS phone_alerts (
@@ -52,662 +85,690 @@ def init_db():
         )
     ''')
     
+    # Tag rows with the camera they came from and who was recognized
+    # (older databases lack the columns)
+    for table in ('phone_alerts', 'sitting_sessions'):
+        cursor.execute(f'PRAGMA table_info({table})')
+        columns = [row[1] for row in cursor.fetchall()]
+        if 'camera_id' not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN camera_id TEXT DEFAULT '0'")
+        if 'person_name' not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN person_name TEXT")
+    
+    # Indexes plus per-day rollups so the dashboard never scans whole tables
+    create_rollups(cursor)
+    
     conn.commit()
     conn.close()
 
 # Initialize database on startup
 init_db()
 
+# Live updates are pushed to browsers over Server-Sent Events
+events = EventBus()
+
+# Alerts and sitting sessions are written off the video path; dashboards
+# are told to refresh once new rows are committed
+db_writer = DatabaseWriter(DATABASE_FILE,
+                           on_commit=lambda generation: events.publish("data_changed", {"generation": generation}))
+db_writer.start()
+
+# Every open dashboard shares one serialized stats response
+dashboard_cache = ResponseCache(ttl=DASHBOARD_CACHE_TTL)
+
 # Timezone GMT+7
 TZ = pytz.timezone('Asia/Jakarta')
 
 # Load Models
-model_seg_n = YOLO('yolov8n-seg.pt')
-model_pose_n = YOLO('yolov8n-pose.pt')
+inference_stage = InferenceStage()
 
 # Face Recognition - Load known faces
-known_face_encodings = []
-known_face_names = []
+# Encodings are cached on disk so only new or changed photos are re-encoded
+face_gallery = FaceGallery(tolerance=0.6)
+face_store = FaceEncodingStore(FACES_FOLDER, FACE_CACHE_FILE, encoder=face_workers)
+face_reload_lock = threading.Lock()
 
 def load_known_faces():
     """Load face encodings from faces folder"""
-    global known_face_encodings, known_face_names
-    
-    known_face_encodings = []
-    known_face_names = []
-    
     if not os.path.exists(FACES_FOLDER):
         print(f"Faces folder not found: {FACES_FOLDER}")
         return
     
-    for filename in os.listdir(FACES_FOLDER):
-        if filename.lower().endswith(('.jpg', '.jpeg', '.png')):
-            filepath = os.path.join(FACES_FOLDER, filename)
-            try:
-                # Load image
-                image = face_recognition.load_image_file(filepath)
-                # Get face encoding
-                encodings = face_recognition.face_encodings(image)
-                
-                if len(encodings) > 0:
-                    # Use first face found
-                    known_face_encodings.append(encodings[0])
-                    # Use filename without extension as name
-                    name = os.path.splitext(filename)[0]
-                    known_face_names.append(name)
-                    print(f"Loaded face: {name}")
-                else:
-                    print(f"No face found in: {filename}")
-            except Exception as e:
-                print(f"Error loading {filename}: {e}")
+    face_gallery.replace(face_store.reload())
+    print(f"Total faces loaded: {face_gallery.identity_count} people, {len(face_gallery)} encodings "
+          f"({face_store.last_encoded} encoded, {face_store.last_reused} from cache)")
+
+def reload_known_faces_async():
+    """Reload faces in the background; returns False if a reload is already running"""
+    if not face_reload_lock.acquire(blocking=False):
+        return False
     
-    print(f"Total faces loaded: {len(known_face_names)}")
+    def run():
+        try:
+            load_known_faces()
+        except Exception as e:
+            print(f"Face reload failed: {e}")
+        finally:
+            face_reload_lock.release()
+    
+    threading.Thread(target=run, name="face-reload", daemon=True).start()
+    return True
 
-# Load known faces on startup
-load_known_faces()
+# Load known faces on startup without holding up the server
+reload_known_faces_async()
 
 # Global state
 settings = {
     "fps_limit": 60,
     "mode": "fast",
     "conf_threshold": 0.25,
-    "low_light_mode": False
+    "low_light_mode": False,
+    "pipeline": DEFAULT_PIPELINE,
+    "batch_max_size": 8,
+    "batch_max_wait_ms": 10,
+    "tracker_method": "greedy",
+    "tracker_motion": False,
+    "snapshot_format": "jpeg",
+    "snapshot_quality": 90,
+    "snapshot_thumbnail_width": 320,
+    # Capture retention (0 = no limit, the default), enforced by a background
+    # pruner once set
+    "capture_retention_days": 0,
+    "capture_max_mb": 0,
+    # Motion gating: skip YOLO while the scene is static
+    "motion_gating": True,
+    "motion_threshold": 25,       # per-pixel gray level change
+    "motion_min_area": 0.005,     # fraction of watched pixels that must change
+    "motion_keepalive": 2.0,      # seconds between refreshes of a static scene
+    "motion_hold": 3.0,           # seconds of full-rate inference after motion
+    # Adaptive scheduling: degrade per-frame work to stay within the budget
+    "target_latency_ms": 100,     # capture-to-publish latency budget
+    "min_detection_rate": 2.0,    # detections per second never drop below this
+    # Headless: only draw overlays when a viewer or a capture needs them
+    "headless": os.environ.get('HEADLESS', '0') == '1'
 }
 
-current_fps = 0
-captures = []
 captures = []
-person_sessions = {}
 sitting_history = []
-last_capture_time = 0
 CAPTURE_COOLDOWN = 3.0
+RECONNECT_MIN_DELAY = 1.0   # seconds before reopening a dropped camera, doubled per failure
+RECONNECT_MAX_DELAY = 30.0
+ERROR_LOG_INTERVAL = 5.0    # seconds between repeated frame error messages
 SITTING_PERSIST_TIME = 1.0
-next_person_id = 0
 recognized_faces = {}  # Store recognized faces with their names
 
+# Captures are stored in day shards and pruned by age and total size
+capture_store = CaptureStore(CAPTURE_FOLDER, THUMBNAIL_FOLDER,
+                             max_age_days=settings["capture_retention_days"],
+                             max_bytes=settings["capture_max_mb"] * 1024 * 1024,
+                             local_time=lambda: datetime.datetime.now(TZ))
+capture_store.start()
 
+# Capture snapshots are encoded and written off the video path
+snapshot_writer = SnapshotWriter(CAPTURE_FOLDER, THUMBNAIL_FOLDER,
+                                 image_format=settings["snapshot_format"],
+                                 quality=settings["snapshot_quality"],
+                                 thumbnail_width=settings["snapshot_thumbnail_width"],
+                                 on_written=capture_store.record)
 
-camera = cv2.VideoCapture(0)
-
-def apply_low_light_enhancement(frame):
-    """Enhance image for low light conditions using CLAHE"""
-    # Convert to LAB color space
-    lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
-    l, a, b = cv2.split(lab)
-    
-    # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization) to L-channel
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-    cl = clahe.apply(l)
-    
-    # Merge and convert back to BGR
-    limg = cv2.merge((cl,a,b))
-    enhanced = cv2.cvtColor(limg, cv2.COLOR_LAB2BGR)
-    return enhanced
-
+# Frames from every camera are batched into shared YOLO calls
+inference_executor = InferenceExecutor(inference_stage,
+                                       max_batch_size=settings["batch_max_size"],
+                                       max_wait=settings["batch_max_wait_ms"] / 1000.0)
 
 def get_local_time():
     """Get current time in GMT+7"""
     return datetime.datetime.now(TZ)
 
-def calculate_angle(a, b, c):
-    """Calculate angle between three points."""
-    a = np.array(a)
-    b = np.array(b)
-    c = np.array(c)
-    
-    radians = np.arctan2(c[1]-b[1], c[0]-b[0]) - np.arctan2(a[1]-b[1], a[0]-b[0])
-    angle = np.abs(radians*180.0/np.pi)
-    
-    if angle > 180.0:
-        angle = 360 - angle
-        
-    return angle
+def classify_objects(detections):
+    """Pick out phone boxes and the names of notable objects in the frame"""
+    phone_boxes = []
+    
+    # Expanded detection details
+    detected_objects = []
+    
+    for cls_id, xyxy in zip(detections.object_classes, detections.object_boxes):
+        # 67: Cell phone, 63: Laptop, 41: Cup, 73: Book
+        if cls_id == 67:
+            phone_boxes.append(xyxy)
+            detected_objects.append("Phone")
+        elif cls_id == 63:
+            detected_objects.append("Laptop")
+        elif cls_id == 41:
+            detected_objects.append("Cup")
+        elif cls_id == 73:
+            detected_objects.append("Book")
+    
+    return phone_boxes, detected_objects
 
-def calculate_iou(box1, box2):
-    """Calculate Intersection over Union between two bounding boxes"""
-    x1_min, y1_min, x1_max, y1_max = box1
-    x2_min, y2_min, x2_max, y2_max = box2
-    
-    inter_x_min = max(x1_min, x2_min)
-    inter_y_min = max(y1_min, y2_min)
-    inter_x_max = min(x1_max, x2_max)
-    inter_y_max = min(y1_max, y2_max)
-    
-    if inter_x_max < inter_x_min or inter_y_max < inter_y_min:
-        return 0.0
-    
-    inter_area = (inter_x_max - inter_x_min) * (inter_y_max - inter_y_min)
-    
-    box1_area = (x1_max - x1_min) * (y1_max - y1_min)
-    box2_area = (x2_max - x2_min) * (y2_max - y2_min)
-    union_area = box1_area + box2_area - inter_area
+def render_detections(frame, detections, face_results, alert_boxes):
+    """Draw YOLO plots, recognized faces and phone alert boxes on a copy of frame.
+    
+    detections may come from an earlier frame; they are drawn over this one
+    rather than over the image they were detected in.
+    """
+    # Faster plotting with reduced line width
+    pose_overlay = detections.pose_result.plot(img=frame, line_width=1, font_size=0.5)
+    if detections.object_result is not None:
+        annotated_frame = detections.object_result.plot(img=frame, line_width=1, font_size=0.5)
+        annotated_frame = cv2.addWeighted(annotated_frame, 0.7, pose_overlay, 0.3, 0)
+    else:
+        annotated_frame = pose_overlay
     
-    if union_area == 0:
-        return 0.0
+    # Draw recognized names on the heads of identified tracks
+    for (top, right, bottom, left, name) in face_results:
+        # Draw rectangle around face
+        cv2.rectangle(annotated_frame, (left, top), (right, bottom), (0, 255, 0), 2)
+        
+        # Draw name label
+        cv2.rectangle(annotated_frame, (left, bottom - 35), (right, bottom), (0, 255, 0), cv2.FILLED)
+        cv2.putText(annotated_frame, name, (left + 6, bottom - 6), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    
+    # Red boxes for phone usage
+    for bbox, label in alert_boxes:
+        x1, y1, x2, y2 = map(int, bbox)
+        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (0, 0, 255), 3)
+        
+        label_size = text_size(label, 0.6, 2)
+        cv2.rectangle(annotated_frame, (x1, y1 - 30), (x1 + label_size[0] + 10, y1), (0, 0, 255), -1)
+        cv2.putText(annotated_frame, label, (x1 + 5, y1 - 8), 
+                  cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
     
-    return inter_area / union_area
+    return annotated_frame
 
-def get_person_bbox(keypoints):
-    """Get bounding box from keypoints"""
-    valid_points = keypoints[keypoints[:, 0] > 0]
-    if len(valid_points) == 0:
-        return None
-    
-    x_min = valid_points[:, 0].min()
-    y_min = valid_points[:, 1].min()
-    x_max = valid_points[:, 0].max()
-    y_max = valid_points[:, 1].max()
-    
-    return [x_min, y_min, x_max, y_max]
+def store_alert(entry):
+    """Record an alert whose snapshot has been written and push it to browsers"""
+    # Save to database (written in the background)
+    db_writer.enqueue('''
+        INSERT INTO phone_alerts (filename, timestamp, date, type, description, camera_id, person_name)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (entry["filename"], entry["timestamp"], entry["date"], entry["type"], entry["description"],
+          entry["camera_id"], entry["person_name"]))
+    
+    # Also keep in memory for quick access
+    entry["id"] = len(captures) + 1
+    captures.insert(0, entry)
+    if len(captures) > 100:
+        captures.pop()
+    # Publish this entry; another camera may have inserted since
+    events.publish("alert", entry)
 
-def match_person_to_session(bbox, current_time, active_ids):
-    """Match current person to existing session using IoU and Distance"""
-    global next_person_id
-    
-    best_match_id = None
-    best_iou = 0.0
-    min_dist = float('inf')
-    
-    # Calculate centroid of current person
-    cx = (bbox[0] + bbox[2]) / 2
-    cy = (bbox[1] + bbox[3]) / 2
-    
-    # First pass: IoU
-    for person_id, session in person_sessions.items():
-        if person_id in active_ids:
-            continue
-            
-        if 'bbox' in session:
-            iou = calculate_iou(bbox, session['bbox'])
-            if iou > best_iou and iou > 0.3:
-                best_iou = iou
-                best_match_id = person_id
-    
-    # Second pass: Distance (if no IoU match)
-    if best_match_id is None:
-        for person_id, session in person_sessions.items():
-            if person_id in active_ids:
-                continue
-                
-            if 'bbox' in session:
-                s_bbox = session['bbox']
-                s_cx = (s_bbox[0] + s_bbox[2]) / 2
-                s_cy = (s_bbox[1] + s_bbox[3]) / 2
-                
-                dist = math.sqrt((cx - s_cx)**2 + (cy - s_cy)**2)
-                
-                # Match if within 200 pixels
-                if dist < 200 and dist < min_dist:
-                    min_dist = dist
-                    best_match_id = person_id
-
-    if best_match_id is None:
-        best_match_id = next_person_id
-        next_person_id += 1
-    
-    return best_match_id
-
-def check_head_down(keypoints):
-    """Check if head is looking down"""
-    if len(keypoints) > 6:
-        nose = keypoints[0][:2]
-        left_eye = keypoints[1][:2]
-        right_eye = keypoints[2][:2]
-        left_shoulder = keypoints[5][:2]
-        right_shoulder = keypoints[6][:2]
-        
-        if all([nose[0] > 0, left_eye[0] > 0, right_eye[0] > 0, 
-                left_shoulder[0] > 0, right_shoulder[0] > 0]):
+def known_name(session):
+    """Recognized name of a tracked person, or None"""
+    name = session.get("name")
+    return name if name and name != UNKNOWN else None
+
+def session_faces(person_sessions, current_time):
+    """(top, right, bottom, left, name) head boxes of identified people in this frame"""
+    faces = []
+    for session in person_sessions.values():
+        if session["last_seen"] == current_time and "name" in session and session.get("head_box") is not None:
+            left, top, right, bottom = map(int, session["head_box"])
+            faces.append((top, right, bottom, left, session["name"]))
+    return faces
+
+def draw_session_timers(frame, person_sessions, current_time, compositor):
+    """Draw a timer card above everyone seen in the last half second"""
+    cards = []
+    for session in person_sessions.values():
+        time_since_seen = current_time - session["last_seen"]
+        
+        # Only draw if seen very recently (prevents ghosting/double timers)
+        if time_since_seen < 0.5:
+            duration = int(current_time - session["start_time"])
+            minutes = duration // 60
+            seconds = duration % 60
             
-            eye_y = (left_eye[1] + right_eye[1]) / 2
-            shoulder_y = (left_shoulder[1] + right_shoulder[1]) / 2
-            nose_to_eye_dist = nose[1] - eye_y
-            eye_to_shoulder_dist = shoulder_y - eye_y
+            timer_text = f"{minutes}m {seconds}s" if minutes > 0 else f"{seconds}s"
+            head_x, head_y = session["head_pos"]
+            status = session.get("status", "Standing").upper()
+            name = known_name(session)
+            if name:
+                status = f"{status} - {name.upper()}"
             
-            if eye_to_shoulder_dist > 0:
-                ratio = nose_to_eye_dist / eye_to_shoulder_dist
-                if ratio > 0.3:
-                    return True
-    
-    return False
-
-def check_sitting_advanced(keypoints, chairs_boxes):
-    """Advanced sitting detection"""
-    if len(keypoints) < 17:
-        return "Standing", 0
-    
-    left_hip = keypoints[11][:2]
-    right_hip = keypoints[12][:2]
-    left_knee = keypoints[13][:2]
-    right_knee = keypoints[14][:2]
-    left_ankle = keypoints[15][:2]
-    right_ankle = keypoints[16][:2]
-    left_shoulder = keypoints[5][:2]
-    right_shoulder = keypoints[6][:2]
-    
-    hip_x = (left_hip[0] + right_hip[0]) / 2
-    hip_y = (left_hip[1] + right_hip[1]) / 2
-    
-    sitting_score = 0
-    knee_angle = 0
-    
-    if all([left_hip[0] > 0, left_knee[0] > 0, left_ankle[0] > 0]):
-        left_angle = calculate_angle(left_hip, left_knee, left_ankle)
-        if 60 < left_angle < 120:
-            sitting_score += 1
-            knee_angle = left_angle
-    
-    if all([right_hip[0] > 0, right_knee[0] > 0, right_ankle[0] > 0]):
-        right_angle = calculate_angle(right_hip, right_knee, right_ankle)
-        if 60 < right_angle < 120:
-            sitting_score += 1
-            if knee_angle == 0:
-                knee_angle = right_angle
-    
-    if left_knee[0] > 0 and right_knee[0] > 0:
-        avg_knee_y = (left_knee[1] + right_knee[1]) / 2
-        hip_knee_diff = hip_y - avg_knee_y
-        
-        if -50 < hip_knee_diff < 100:
-            sitting_score += 1
-    
-    if all([left_shoulder[0] > 0, right_shoulder[0] > 0, hip_x > 0]):
-        shoulder_y = (left_shoulder[1] + right_shoulder[1]) / 2
-        torso_vertical_dist = hip_y - shoulder_y
-        shoulder_x = (left_shoulder[0] + right_shoulder[0]) / 2
-        torso_horizontal_dist = abs(hip_x - shoulder_x)
-        
-        if torso_vertical_dist > 0 and torso_horizontal_dist < torso_vertical_dist * 0.5:
-            sitting_score += 1
-    
-    if sitting_score >= 2:
-        # If pose strongly suggests sitting, we don't strictly need a chair
-        return "Sitting", knee_angle
-    
-    return "Standing", 0
-
-def check_phone_in_hand(keypoints, phone_boxes):
-    """Check if phone is near wrists (simulating Phone-Hand class)"""
-    if len(keypoints) < 17:
-        return False
-        
-    l_wrist = keypoints[9][:2]
-    r_wrist = keypoints[10][:2]
+            # Timer for both Sitting and Standing
+            cards.append((head_x, head_y, timer_text, status))
     
-    for box in phone_boxes:
-        x1, y1, x2, y2 = box
-        # Expand box slightly for wrist tolerance
-        margin = 40
-        
-        # Check Left Wrist
-        if l_wrist[0] > 0:
-            if (x1 - margin <= l_wrist[0] <= x2 + margin) and (y1 - margin <= l_wrist[1] <= y2 + margin):
-                return True
-                
-        # Check Right Wrist
-        if r_wrist[0] > 0:
-            if (x1 - margin <= r_wrist[0] <= x2 + margin) and (y1 - margin <= r_wrist[1] <= y2 + margin):
-                return True
-                
-    return False
+    # All cards in one pass, blending only each card's own region
+    compositor.draw_cards(frame, cards)
 
-def draw_timer_card(frame, x, y, timer_text, status="SITTING"):
-    """Draw glassmorphism timer card"""
-    padding = 20
-    text_size = cv2.getTextSize(timer_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
-    label_size = cv2.getTextSize(status, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
-    
-    card_width = max(text_size[0], label_size[0]) + padding * 2
-    card_height = 70
-    
-    card_x = x - card_width // 2
-    card_y = y - 100
-    
-    card_x = max(10, min(card_x, frame.shape[1] - card_width - 10))
-    card_y = max(10, card_y)
-    
-    overlay = frame.copy()
-    
-    cv2.rectangle(overlay, 
-                 (card_x, card_y), 
-                 (card_x + card_width, card_y + card_height),
-                 (20, 20, 20), -1)
-    
-    cv2.rectangle(overlay, 
-                 (card_x, card_y), 
-                 (card_x + card_width, card_y + card_height),
-                 (100, 100, 100), 2)
-    
-    alpha = 0.75
-    cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
-    
-    # Color based on status
-    # Orange for Sitting, Blue for Standing
-    color = (255, 149, 0) if status == "SITTING" else (0, 149, 255)
-    
-    cv2.rectangle(frame,
-                 (card_x, card_y),
-                 (card_x + card_width, card_y + 4),
-                 color, -1)
-    
-    label_x = card_x + (card_width - label_size[0]) // 2
-    cv2.putText(frame, status, 
-               (label_x, card_y + 25),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1)
-    
-    timer_x = card_x + (card_width - text_size[0]) // 2
-    cv2.putText(frame, timer_text,
-               (timer_x, card_y + 55),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
-
-def generate_frames():
-    global current_fps, last_capture_time, person_sessions, sitting_history
-    
-    prev_time = time.time()
+class CameraPipeline:
+    """Capture worker and isolated tracking state for one camera"""
+    
+    def __init__(self, camera_id, name, source, motion_regions=None):
+        self.camera_id = camera_id
+        self.name = name
+        self.source = source
+        self.capture = open_camera_source(source)
+        # Files are replayed at their own frame rate; live sources as they arrive
+        self.grabber = CameraGrabber(self.capture, pace=not is_live_source(source))
+        self.broadcaster = FrameBroadcaster()
+        self.thread = None
+        self.lock = threading.Lock()
+        
+        # Per-camera state so tracking and cooldowns never leak between streams
+        self.current_fps = 0
+        self.person_sessions = {}
+        self.tracker = PersonTracker(method=settings["tracker_method"], motion=settings["tracker_motion"])
+        self.last_capture_time = 0
+        self.identities = TrackIdentifier(face_gallery, face_workers)
+        self.preprocessor = FramePreprocessor()
+        self.motion = MotionGate(regions=motion_regions,
+                                 pixel_threshold=settings["motion_threshold"],
+                                 min_changed=settings["motion_min_area"],
+                                 keepalive=settings["motion_keepalive"],
+                                 hold=settings["motion_hold"])
+        self.last_detections = None
+        self.last_results = ([], False, [])
+        self.last_update_time = None
+        self.scheduler = FrameScheduler(target_latency=settings["target_latency_ms"] / 1000.0,
+                                        min_detection_rate=settings["min_detection_rate"])
+        self.overlay = OverlayCompositor()
+        self._reset_requested = False
+        
+        # Failure metrics
+        self.reconnects = 0
+        self.frame_errors = 0
+        self.last_error = None
+        self._last_error_logged = float("-inf")
+    
+    def start(self):
+        """Start the producer thread for this camera if it is not already running"""
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.broadcaster.reopen()
+            self.thread = threading.Thread(target=self.run, name=f"camera-{self.camera_id}", daemon=True)
+            self.thread.start()
+    
+    def reset_sessions(self):
+        """Drop all tracked sessions before the next frame (safe from any thread)"""
+        self._reset_requested = True
+    
+    def sitting_count(self):
+        return len([s for s in self.person_sessions.values() if s.get('status') == 'Sitting'])
+    
+    def stats(self):
+        return {
+            "id": self.camera_id,
+            "name": self.name,
+            "running": self.thread is not None and self.thread.is_alive(),
+            "fps": self.current_fps,
+            "viewers": self.broadcaster.subscribers,
+            "stream_encodes": self.broadcaster.encodes,
+            "sitting_count": self.sitting_count(),
+            "capture": self.grabber.stats(),
+            "low_light": self.preprocessor.stats(),
+            "motion": self.motion.stats(),
+            "scheduler": self.scheduler.stats(),
+            "faces": self.identities.stats(),
+            "reconnects": self.reconnects,
+            "frame_errors": self.frame_errors,
+            "last_error": self.last_error
+        }
     
-    while True:
-        loop_start = time.time()
+    def run(self):
+        """Capture, run inference and publish annotated frames to all viewers"""
+        prev_time = 0
+        reconnect_delay = RECONNECT_MIN_DELAY
         
-        success, frame = camera.read()
-        if not success:
-            break
+        # A file that already ended (or a device that failed) is reopened
+        # when the camera is started again
+        if self.grabber.failed:
+            self.reopen()
+        self.grabber.start()
+    
+        while True:
+            # Pace output by waiting for the next slot *before* picking a frame,
+            # so the frame we run inference on is always the freshest one
+            target_interval = 1.0 / settings["fps_limit"]
+            grabbed = self.grabber.read_latest(not_before=prev_time + target_interval)
+            if grabbed is None:
+                if self.grabber.failed:
+                    if not is_live_source(self.source):
+                        break
+                    # Stream dropped: reopen with exponential backoff
+                    print(f"Camera {self.camera_id} lost, reconnecting in {reconnect_delay:.0f}s")
+                    time.sleep(reconnect_delay)
+                    reconnect_delay = min(reconnect_delay * 2, RECONNECT_MAX_DELAY)
+                    self.reopen()
+                    self.grabber.start()
+                continue
+            _, captured_at, frame = grabbed
+            reconnect_delay = RECONNECT_MIN_DELAY
+        
+            prev_time = time.time()
             
-        time_diff = time.time() - prev_time
-        target_interval = 1.0 / settings["fps_limit"]
-        if time_diff < target_interval:
-            time.sleep(target_interval - time_diff)
+            try:
+                self.process_frame(frame, captured_at)
+                publish_live_stats()
+            except Exception as e:
+                self.record_error(e)
             
-        prev_time = time.time()
+            # Measured output rate, not just the last iteration
+            self.current_fps = int(round(self.scheduler.output_fps))
+    
+        self.broadcaster.close()
+    
+    def reopen(self):
+        """Open the source again after a failure"""
+        self.reconnects += 1
+        self.capture = open_camera_source(self.source)
+        self.grabber.replace_capture(self.capture)
+    
+    def record_error(self, error):
+        """Count a failed frame and log it, without flooding the log"""
+        self.frame_errors += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        now = time.time()
+        if now - self._last_error_logged >= ERROR_LOG_INTERVAL:
+            print(f"Camera {self.camera_id} frame failed ({self.frame_errors} so far): {self.last_error}")
+            self._last_error_logged = now
+    
+    def process_frame(self, frame, captured_at=None):
+        """Detect, track, alert and (only if needed) render one frame.
         
-        # Apply low light enhancement if enabled
-        if settings.get("low_light_mode", False):
-            frame = apply_low_light_enhancement(frame)
+        The scheduler decides how much of that to do: the full pipeline, the
+        pose model only, or no inference at all with the tracks carried
+        forward from the previous detections.
+        """
+        started = time.time()
+        if captured_at is None:
+            captured_at = started
         
-        conf = settings["conf_threshold"]
+        if self._reset_requested:
+            self._reset_requested = False
+            self.person_sessions = {}
+            self.last_results = ([], False, [])
         
-        # Optimized YOLO inference - smaller resolution (416 instead of 640)
-        # Use half precision if available for faster inference
-        results_seg = model_seg_n(frame, conf=conf, verbose=False, imgsz=416, half=True)
-        results_pose = model_pose_n(frame, conf=conf, verbose=False, imgsz=416, half=True)
+        # Every derived input (low-light variant, face crops) comes from the
+        # raw frame, computed once into reused buffers
+        prepared = self.preprocessor.prepare(frame, low_light=settings.get("low_light_mode", False))
+        frame = prepared.image
         
-        # Faster plotting with reduced line width
-        annotated_frame = results_seg[0].plot(line_width=1, font_size=0.5)
-        pose_overlay = results_pose[0].plot(line_width=1, font_size=0.5)
-        annotated_frame = cv2.addWeighted(annotated_frame, 0.7, pose_overlay, 0.3, 0)
+        level = self.choose_level(prepared, started, captured_at)
         
-        chairs_boxes = []
-        phone_boxes = []
-        phone_detected = False
-        
-        # Expanded detection details
-        detected_objects = []
+        conf = settings["conf_threshold"]
+        current_time = time.time()
         
-        if results_seg[0].boxes is not None:
-            for box in results_seg[0].boxes:
-                cls_id = int(box.cls[0])
-                xyxy = box.xyxy[0].cpu().numpy()
-                conf_score = float(box.conf[0])
-                
-                # 56: Chair, 67: Cell phone, 63: Laptop, 41: Cup, 73: Book
-                if cls_id == 56:
-                    chairs_boxes.append(xyxy)
-                elif cls_id == 67:
-                    phone_detected = True
-                    phone_boxes.append(xyxy)
-                    detected_objects.append("Phone")
-                elif cls_id == 63:
-                    detected_objects.append("Laptop")
-                elif cls_id == 41:
-                    detected_objects.append("Cup")
-                elif cls_id == 73:
-                    detected_objects.append("Book")
-        
-        # Face Recognition - Optimized (run every 3 frames)
-        frame_count = getattr(generate_frames, 'frame_count', 0)
-        frame_count += 1
-        generate_frames.frame_count = frame_count
-        
-        # Get persistent face results
-        face_results = getattr(generate_frames, 'face_results', [])
-        
-        if len(known_face_encodings) > 0 and frame_count % 3 == 0:
-            # Convert BGR to RGB for face_recognition
-            rgb_frame = cv2.cvtColor(annotated_frame, cv2.COLOR_BGR2RGB)
-            
-            # Resize frame more aggressively for faster processing (25% size)
-            small_frame = cv2.resize(rgb_frame, (0, 0), fx=0.25, fy=0.25)
+        if level in DETECTION_LEVELS:
+            # Optimized YOLO inference - smaller resolution (416 instead of 640)
+            # Use half precision if available for faster inference
+            pipeline = settings["pipeline"] if level == LEVEL_FULL else "pose-only"
+            detections = inference_executor.infer(frame, pipeline, conf, source=self.camera_id)
             
-            # Find faces in frame (use faster HOG model)
-            face_locations = face_recognition.face_locations(small_frame, model="hog")
+            phone_boxes, detected_objects = classify_objects(detections)
             
-            # Prepare new results list
-            new_results = []
-            
-            # Only get encodings if faces found
-            if len(face_locations) > 0:
-                face_encodings = face_recognition.face_encodings(small_frame, face_locations)
-                
-                # Process each face
-                for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
-                    # Scale back up face locations (4x because 25% resize)
-                    top *= 4
-                    right *= 4
-                    bottom *= 4
-                    left *= 4
-                    
-                    # Compare with known faces
-                    matches = face_recognition.compare_faces(known_face_encodings, face_encoding, tolerance=0.6)
-                    name = "Unknown"
-                    
-                    # Use the known face with smallest distance
-                    face_distances = face_recognition.face_distance(known_face_encodings, face_encoding)
-                    if len(face_distances) > 0:
-                        best_match_index = np.argmin(face_distances)
-                        if matches[best_match_index]:
-                            name = known_face_names[best_match_index]
-                    
-                    new_results.append((top, right, bottom, left, name))
+            current_time = time.time()
+            alerts, holding_phone = self.update_people(detections, phone_boxes, current_time)
             
-            # Update persistent results (clears if no faces found)
-            face_results = new_results
-            generate_frames.face_results = face_results
-
-        # Draw faces from persistent results (every frame)
-        for (top, right, bottom, left, name) in face_results:
-            # Draw rectangle around face
-            cv2.rectangle(annotated_frame, (left, top), (right, bottom), (0, 255, 0), 2)
+            # Identify new tracks (and re-check old ones now and then) from head
+            # crops of the prepared frame, never from drawn-over output
+            self.identities.update(prepared, self.person_sessions, current_time)
             
-            # Draw name label
-            cv2.rectangle(annotated_frame, (left, bottom - 35), (right, bottom), (0, 255, 0), cv2.FILLED)
-            cv2.putText(annotated_frame, name, (left + 6, bottom - 6), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+            self.last_detections = detections
+            self.last_results = (alerts, holding_phone, detected_objects)
+            if settings["motion_gating"]:
+                # Later frames are compared with this one
+                self.motion.mark_run(started)
+        else:
+            # Don't let other cameras' batches wait for this one
+            inference_executor.release(self.camera_id)
+            detections = self.last_detections
+            alerts, holding_phone, detected_objects = self.last_results
+            self.carry_sessions_forward(current_time, extrapolate=level == LEVEL_TRACK)
+            alerts = [alert for alert in alerts if alert[2] in self.person_sessions]
+        self.last_update_time = current_time
         
-        current_time = time.time()
-        active_person_ids = set()
-        trigger_capture = False
+        alert_boxes = []
+        alert_names = []
+        for bbox, label, person_id in alerts:
+            name = known_name(self.person_sessions[person_id])
+            if name:
+                label = f"{label}: {name}"
+                alert_names.append(name)
+            alert_boxes.append((bbox, label))
+        
+        # Overlays are only drawn when a viewer or a capture snapshot needs them
+        render = not settings["headless"] or self.broadcaster.has_subscribers
+        capture_due = bool(alert_boxes) and current_time - self.last_capture_time > CAPTURE_COOLDOWN
         
-        if results_pose[0].keypoints is not None:
-            for idx, kps in enumerate(results_pose[0].keypoints.data):
-                kps_np = kps.cpu().numpy()
-                status, angle = check_sitting_advanced(kps_np, chairs_boxes)
+        annotated_frame = None
+        if render or capture_due:
+            face_results = session_faces(self.person_sessions, current_time)
+            annotated_frame = render_detections(frame, detections, face_results, alert_boxes)
+        
+        # Capture logic: Triggered if Red Box was drawn (Phone or Head Down)
+        if capture_due:
+            self.record_alert(annotated_frame, holding_phone, detected_objects, alert_names, current_time)
+        
+        if level != LEVEL_RENDER:
+            self.close_finished_sessions(current_time)
+        
+        if render:
+            draw_session_timers(annotated_frame, self.person_sessions, current_time, self.overlay)
+            # JPEG encoding (quality 70 by default) happens lazily, once per
+            # frame and tier, and only if someone is watching
+            self.broadcaster.publish(annotated_frame)
+        
+        self.scheduler.record(level, started, captured_at)
+    
+    def choose_level(self, prepared, started, captured_at):
+        """How much work this frame gets (see FrameScheduler)"""
+        moving = not settings["motion_gating"] or self.motion.check(prepared.raw, started)
+        if self.last_detections is None:
+            allowed = DETECTION_LEVELS
+        elif not moving:
+            # Static scene: nothing new for YOLO to find
+            allowed = (LEVEL_TRACK, LEVEL_RENDER)
+        else:
+            allowed = LEVELS
+        return self.scheduler.choose(started - captured_at, started, allowed)
+    
+    def carry_sessions_forward(self, current_time, extrapolate):
+        """Keep everyone seen in the last update alive without new detections.
+        
+        With extrapolate (and the tracker's motion model on), timer cards
+        follow each person's estimated velocity.
+        """
+        carried = [pid for pid, session in self.person_sessions.items()
+                   if session["last_seen"] == self.last_update_time]
+        if extrapolate and self.tracker.motion and carried and self.last_update_time is not None:
+            dt = current_time - self.last_update_time
+            for pid, (vx, vy) in zip(carried, self.tracker.motion_model.velocities(carried)):
+                head_x, head_y = self.person_sessions[pid]["head_pos"]
+                self.person_sessions[pid]["head_pos"] = (int(head_x + vx * dt), int(head_y + vy * dt))
+        for pid in carried:
+            self.person_sessions[pid]["last_seen"] = current_time
+    
+    def update_people(self, detections, phone_boxes, current_time):
+        """Classify postures, flag phone use and update tracked sessions.
+        
+        Returns (bbox, label, person_id) for everyone raising an alert and
+        whether anyone was seen holding a phone.
+        """
+        people = []
+        holding_phone = False
+        
+        if detections.keypoints is not None and len(detections.keypoints):
+            # Classify everyone in the frame in a handful of array ops
+            posture = analyze_postures(detections.keypoints, phone_boxes)
+            
+            for idx, kps_np in enumerate(detections.keypoints):
+                status = "Sitting" if posture["sitting"][idx] else "Standing"
                 
                 # Track both Sitting and Standing
                 head_x, head_y = int(kps_np[0][0]), int(kps_np[0][1])
                 
-                if head_x > 0 and head_y > 0:
-                    bbox = get_person_bbox(kps_np)
+                if head_x > 0 and head_y > 0 and posture["has_bbox"][idx]:
+                    bbox = posture["bboxes"][idx].tolist()
                     
-                    if bbox is not None:
-                        # Check for phone usage (Head Down OR Phone Object Nearby OR Phone in Hand)
-                        is_head_down = check_head_down(kps_np)
-                        is_holding_phone = check_phone_in_hand(kps_np, phone_boxes)
-                        has_phone_nearby = False
-                        
-                        # Check overlap with any detected phone (if not already confirmed holding)
-                        if not is_holding_phone:
-                            for phone_box in phone_boxes:
-                                if calculate_iou(bbox, phone_box) > 0.01: # Any overlap
-                                    has_phone_nearby = True
-                                    break
-                        
-                        # Draw Red Box if Phone Usage Detected
-                        if is_head_down or has_phone_nearby or is_holding_phone:
-                            x1, y1, x2, y2 = map(int, bbox)
-                            # Red Box
-                            cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (0, 0, 255), 3)
-                            
-                            # Label
-                            if is_holding_phone:
-                                label = "PHONE IN HAND"
-                            elif has_phone_nearby:
-                                label = "PHONE DETECTED"
-                            else:
-                                label = "SUSPECTED PHONE"
-                                
-                            label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-                            cv2.rectangle(annotated_frame, (x1, y1 - 30), (x1 + label_size[0] + 10, y1), (0, 0, 255), -1)
-                            cv2.putText(annotated_frame, label, (x1 + 5, y1 - 8), 
-                                      cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                            
-                            trigger_capture = True
-
-                        person_id = match_person_to_session(bbox, current_time, active_person_ids)
-                        active_person_ids.add(person_id)
-                        
-                        if person_id not in person_sessions:
-                            person_sessions[person_id] = {
-                                "start_time": current_time,
-                                "last_seen": current_time,
-                                "head_pos": (head_x, head_y),
-                                "bbox": bbox,
-                                "status": status
-                            }
-                        else:
-                            # Check if status changed
-                            old_status = person_sessions[person_id].get("status", "Standing")
-                            if old_status != status:
-                                # Status changed, reset timer
-                                person_sessions[person_id]["start_time"] = current_time
-                                person_sessions[person_id]["status"] = status
-                            
-                            person_sessions[person_id]["last_seen"] = current_time
-                            person_sessions[person_id]["head_pos"] = (head_x, head_y)
-                            person_sessions[person_id]["bbox"] = bbox
+                    # Check for phone usage (Head Down OR Phone Object Nearby OR Phone in Hand)
+                    is_head_down = bool(posture["head_down"][idx])
+                    is_holding_phone = bool(posture["phone_in_hand"][idx])
+                    has_phone_nearby = not is_holding_phone and bool(posture["phone_nearby"][idx])
+                    
+                    # Red Box if Phone Usage Detected
+                    alert = None
+                    if is_holding_phone:
+                        alert = "PHONE IN HAND"
+                        holding_phone = True
+                    elif has_phone_nearby:
+                        alert = "PHONE DETECTED"
+                    elif is_head_down:
+                        alert = "SUSPECTED PHONE"
+                    
+                    head_box = posture["head_boxes"][idx].tolist() if posture["has_head"][idx] else None
+                    people.append((bbox, status, head_x, head_y, head_box, alert))
         
-        # Capture logic: Triggered if Red Box was drawn (Phone or Head Down)
-        if trigger_capture:
-            current_time = time.time()
-            if current_time - last_capture_time > CAPTURE_COOLDOWN:
-                local_time = get_local_time()
-                timestamp_file = local_time.strftime("%Y%m%d_%H%M%S")
-                timestamp_display = local_time.strftime("%H:%M:%S")
-                date_display = local_time.strftime("%Y-%m-%d")
-                
-                filename = f"capture_{timestamp_file}.jpg"
-                filepath = os.path.join(CAPTURE_FOLDER, filename)
-                cv2.imwrite(filepath, annotated_frame)
-                
-                # Determine alert type
-                if is_holding_phone:
-                    alert_type = "Phone in Hand"
-                    description = "Person detected holding phone"
-                elif phone_detected:
-                    alert_type = "Phone Usage"
-                    description = "Person detected using phone"
-                else:
-                    alert_type = "Suspected Phone Use"
-                    description = "Head down pose detected (Suspected phone use)"
-                
-                # Add context about other objects
-                if detected_objects:
-                    unique_objs = list(set([o for o in detected_objects if o != "Phone"]))
-                    if unique_objs:
-                        description += f" near {', '.join(unique_objs)}"
-                
-                # Save to database
-                conn = sqlite3.connect(DATABASE_FILE)
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO phone_alerts (filename, timestamp, date, type, description)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (filename, timestamp_display, date_display, alert_type, description))
-                conn.commit()
-                conn.close()
+        # Assign IDs to everyone in the frame at once
+        person_ids = self.tracker.assign([p[0] for p in people], self.person_sessions, current_time)
+        
+        alerts = []
+        for (bbox, status, head_x, head_y, head_box, alert), person_id in zip(people, person_ids):
+            if person_id not in self.person_sessions:
+                self.person_sessions[person_id] = {
+                    "start_time": current_time,
+                    "last_seen": current_time,
+                    "head_pos": (head_x, head_y),
+                    "head_box": head_box,
+                    "bbox": bbox,
+                    "status": status
+                }
+            else:
+                # Check if status changed
+                old_status = self.person_sessions[person_id].get("status", "Standing")
+                if old_status != status:
+                    # Status changed, reset timer
+                    self.person_sessions[person_id]["start_time"] = current_time
+                    self.person_sessions[person_id]["status"] = status
                 
-                # Also keep in memory for quick access
-                captures.insert(0, {
-                    "id": len(captures) + 1,
-                    "filename": filename,
-                    "timestamp": timestamp_display,
-                    "date": date_display,
-                    "type": alert_type,
-                    "description": description
-                })
-                if len(captures) > 100:
-                    captures.pop()
-                last_capture_time = current_time
-
-        for person_id, session in list(person_sessions.items()):
+                self.person_sessions[person_id]["last_seen"] = current_time
+                self.person_sessions[person_id]["head_pos"] = (head_x, head_y)
+                self.person_sessions[person_id]["head_box"] = head_box
+                self.person_sessions[person_id]["bbox"] = bbox
+            
+            if alert:
+                alerts.append((bbox, alert, person_id))
+        
+        return alerts, holding_phone
+    
+    def record_alert(self, annotated_frame, holding_phone, detected_objects, names, current_time):
+        """Save a phone alert snapshot and queue its database row"""
+        local_time = get_local_time()
+        timestamp_display = local_time.strftime("%H:%M:%S")
+        date_display = local_time.strftime("%Y-%m-%d")
+        
+        # e.g. 2025/12/16/capture_0_20251216_080208_1a2b3c4d.jpg
+        filename = capture_store.new_path(self.camera_id, local_time, snapshot_writer.extension)
+        
+        # Determine alert type
+        if holding_phone:
+            alert_type = "Phone in Hand"
+            description = "Person detected holding phone"
+        elif "Phone" in detected_objects:
+            alert_type = "Phone Usage"
+            description = "Person detected using phone"
+        else:
+            alert_type = "Suspected Phone Use"
+            description = "Head down pose detected (Suspected phone use)"
+        
+        # Name whoever was recognized instead of "Person"
+        person_name = ", ".join(sorted(set(names))) or None
+        if person_name:
+            description = description.replace("Person", person_name, 1)
+        
+        # Add context about other objects
+        if detected_objects:
+            unique_objs = list(set([o for o in detected_objects if o != "Phone"]))
+            if unique_objs:
+                description += f" near {', '.join(unique_objs)}"
+        
+        entry = {
+            "filename": filename,
+            "timestamp": timestamp_display,
+            "date": date_display,
+            "type": alert_type,
+            "description": description,
+            "camera_id": self.camera_id,
+            "person_name": person_name,
+            "thumbnail": capture_store.thumbnail_for(filename) if snapshot_writer.thumbnail_width else None
+        }
+        
+        # Encode and write in the background; the alert is only stored and
+        # announced once its image exists. If the writers are backed up the
+        # snapshot is dropped and the cooldown is not started, so the next
+        # frame simply tries again.
+        if not snapshot_writer.submit(annotated_frame.copy(), filename, on_done=lambda: store_alert(entry)):
+            return
+        self.last_capture_time = current_time
+    
+    def close_finished_sessions(self, current_time):
+        """Log sitting sessions that have ended and drop stale sessions"""
+        for person_id, session in list(self.person_sessions.items()):
             time_since_seen = current_time - session["last_seen"]
             status = session.get("status", "Standing")
             
-            # Only draw if seen very recently (prevents ghosting/double timers)
-            if time_since_seen < 0.5:
-                duration = int(current_time - session["start_time"])
-                minutes = duration // 60
-                seconds = duration % 60
-                
-                timer_text = f"{minutes}m {seconds}s" if minutes > 0 else f"{seconds}s"
-                head_x, head_y = session["head_pos"]
-                
-                # Draw timer for both Sitting and Standing
-                draw_timer_card(annotated_frame, head_x, head_y, timer_text, status.upper())
-                
             # Check for session end (for saving to DB)
             if time_since_seen >= SITTING_PERSIST_TIME:
                 # Only save SITTING sessions to history/DB
-                if status == "Sitting" and person_id not in [s.get('person_id') for s in sitting_history]:
+                already_saved = any(s.get('person_id') == person_id and s.get('camera_id') == self.camera_id
+                                    for s in sitting_history)
+                if status == "Sitting" and not already_saved:
                     duration = int(session["last_seen"] - session["start_time"])
                     if duration >= 5:  # Only save if sat for at least 5 seconds
                         local_time = get_local_time()
                         timestamp_display = local_time.strftime("%H:%M:%S")
                         date_display = local_time.strftime("%Y-%m-%d")
                         
-                        # Save to database
-                        conn = sqlite3.connect(DATABASE_FILE)
-                        cursor = conn.cursor()
-                        cursor.execute('''
-                            INSERT INTO sitting_sessions (person_id, duration, timestamp, date)
-                            VALUES (?, ?, ?, ?)
-                        ''', (person_id, duration, timestamp_display, date_display))
-                        conn.commit()
-                        conn.close()
+                        person_name = known_name(session)
+                        
+                        # Save to database (written in the background)
+                        db_writer.enqueue('''
+                            INSERT INTO sitting_sessions (person_id, duration, timestamp, date, camera_id, person_name)
+                            VALUES (?, ?, ?, ?, ?, ?)
+                        ''', (person_id, duration, timestamp_display, date_display, self.camera_id, person_name))
                         
                         # Also keep in memory
-                        sitting_history.insert(0, {
+                        entry = {
                             "person_id": person_id,
                             "duration": duration,
                             "timestamp": timestamp_display,
-                            "date": date_display
-                        })
+                            "date": date_display,
+                            "camera_id": self.camera_id,
+                            "person_name": person_name
+                        }
+                        sitting_history.insert(0, entry)
                         if len(sitting_history) > 50:
                             sitting_history.pop()
+                        events.publish("sitting", entry)
         
         # Clean up old sessions
-        person_sessions = {
-            pid: session for pid, session in person_sessions.items()
+        self.person_sessions = {
+            pid: session for pid, session in self.person_sessions.items()
             if current_time - session["last_seen"] < SITTING_PERSIST_TIME
         }
-        
-        loop_time = time.time() - loop_start
-        if loop_time > 0:
-            current_fps = int(1.0 / loop_time)
 
-        # Faster JPEG encoding with lower quality (70 instead of 85)
-        ret, buffer = cv2.imencode('.jpg', annotated_frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
-        frame_bytes = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+def publish_live_stats():
+    """Push FPS and counts to live clients when they change"""
+    events.publish_state("stats", {
+        "fps": cameras[default_camera_id].current_fps,
+        "cameras": {camera_id: camera.current_fps for camera_id, camera in cameras.items()},
+        "sitting_count": sum(camera.sitting_count() for camera in cameras.values()),
+        "capture_count": len(captures)
+    }, min_interval=LIVE_STATS_INTERVAL)
+
+# Camera registry: one pipeline per configured camera
+cameras = {
+    cam["id"]: CameraPipeline(cam["id"], cam["name"], cam["source"], cam.get("motion_regions"))
+    for cam in load_camera_registry(CAMERAS_CONFIG)
+}
+default_camera_id = next(iter(cameras))
+
+def start_cameras():
+    for camera in cameras.values():
+        camera.start()
 
 @app.route('/')
 def index():
@@ -717,26 +778,102 @@ def index():
 def dashboard():
     return render_template('dashboard.html')
 
+def get_camera_or_404(camera_id):
+    camera = cameras.get(camera_id)
+    if camera is None:
+        abort(404, description=f"Unknown camera: {camera_id}")
+    return camera
+
 @app.route('/video_feed')
-def video_feed():
-    return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+@app.route('/video_feed/<camera_id>')
+def video_feed(camera_id=None):
+    camera = get_camera_or_404(camera_id or default_camera_id)
+    camera.start()
+    # Optional reduced variant for slow links, e.g. /video_feed?width=640&q=50
+    width = request.args.get('width', type=int)
+    quality = request.args.get('q', type=int)
+    return Response(camera.broadcaster.subscribe(width, quality), mimetype='multipart/x-mixed-replace; boundary=frame')
+
+@app.route('/api/events')
+def event_stream():
+    """Server-Sent Events: stats, alert, sitting, data_changed and reset"""
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    response = Response(events.subscribe(last_event_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/events/stats')
+def get_event_stats():
+    return jsonify(events.stats())
+
+@app.route('/api/cameras')
+def get_cameras():
+    return jsonify({
+        "default": default_camera_id,
+        "cameras": [camera.stats() for camera in cameras.values()]
+    })
+
+@app.route('/api/cameras/<camera_id>/stats')
+def get_camera_stats(camera_id):
+    return jsonify(get_camera_or_404(camera_id).stats())
+
+@app.route('/api/inference/stats')
+def get_inference_stats():
+    return jsonify(inference_executor.stats())
+
+@app.route('/api/snapshots/stats')
+def get_snapshot_stats():
+    return jsonify(dict(snapshot_writer.stats(), storage=capture_store.stats()))
+
+@app.route('/api/faces')
+def get_faces():
+    return jsonify({
+        "people": face_gallery.identity_count,
+        "encodings": len(face_gallery),
+        "reloading": face_reload_lock.locked(),
+        "cache": face_store.stats(),
+        "workers": face_workers.stats()
+    })
+
+@app.route('/api/faces/reload', methods=['POST'])
+def reload_faces():
+    if not reload_known_faces_async():
+        return jsonify({"status": "error", "message": "A face reload is already running"}), 409
+    return jsonify({"status": "success", "message": "Face reload started"})
+
+@app.route('/api/db/stats')
+def get_db_stats():
+    return jsonify(dict(db_writer.stats(), dashboard_cache=dashboard_cache.stats()))
 
 @app.route('/api/stats')
 def get_stats():
+    camera = get_camera_or_404(request.args.get('camera', default_camera_id))
     return jsonify({
-        "fps": current_fps,
+        "fps": camera.current_fps,
+        "viewers": sum(cam.broadcaster.subscribers for cam in cameras.values()),
+        "capture": camera.grabber.stats(),
         "capture_count": len(captures),
         "captures": captures[:10],
-        "sitting_count": len([s for s in person_sessions.values() if s.get('status') == 'Sitting'])
+        "sitting_count": sum(cam.sitting_count() for cam in cameras.values())
     })
 
 @app.route('/api/dashboard/stats')
 def get_dashboard_stats():
+    """Shared, briefly cached stats; unchanged responses are a bodyless 304"""
+    body, etag = dashboard_cache.get(db_writer.generation, build_dashboard_stats)
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Let browsers keep the body but revalidate it on every poll
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def build_dashboard_stats():
     conn = sqlite3.connect(DATABASE_FILE)
     cursor = conn.cursor()
     
-    # Get all phone alerts from database
-    cursor.execute('SELECT * FROM phone_alerts ORDER BY created_at DESC LIMIT 50')
+    # Latest phone alerts (walks the created_at index backwards)
+    cursor.execute('SELECT * FROM phone_alerts ORDER BY created_at DESC, id DESC LIMIT 50')
     alerts_rows = cursor.fetchall()
     alerts = []
     for row in alerts_rows:
@@ -746,11 +883,12 @@ def get_dashboard_stats():
             "timestamp": row[2],
             "date": row[3],
             "type": row[4],
-            "description": row[5]
+            "description": row[5],
+            "thumbnail": capture_store.thumbnail_for(row[1])
         })
     
-    # Get all sitting sessions from database
-    cursor.execute('SELECT * FROM sitting_sessions ORDER BY created_at DESC LIMIT 50')
+    # Latest sitting sessions
+    cursor.execute('SELECT * FROM sitting_sessions ORDER BY created_at DESC, id DESC LIMIT 50')
     sitting_rows = cursor.fetchall()
     sitting = []
     for row in sitting_rows:
@@ -762,137 +900,239 @@ def get_dashboard_stats():
             "date": row[4]
         })
     
-    # Calculate statistics
-    cursor.execute('SELECT COUNT(*) FROM phone_alerts')
+    # Totals come from the daily rollups: one row per day, not per event
+    cursor.execute('SELECT COALESCE(SUM(alerts), 0) FROM daily_alerts')
     total_alerts = cursor.fetchone()[0]
     
-    cursor.execute('SELECT COUNT(*) FROM sitting_sessions')
-    total_sitting_sessions = cursor.fetchone()[0]
-    
-    cursor.execute('SELECT AVG(duration) FROM sitting_sessions')
-    avg_result = cursor.fetchone()[0]
-    avg_sitting_duration = int(avg_result) if avg_result else 0
+    cursor.execute('SELECT COALESCE(SUM(sessions), 0), COALESCE(SUM(total_duration), 0) FROM daily_sitting')
+    total_sitting_sessions, total_duration = cursor.fetchone()
+    avg_sitting_duration = int(total_duration / total_sitting_sessions) if total_sitting_sessions else 0
     
     # Today's stats
     today = get_local_time().strftime("%Y-%m-%d")
-    cursor.execute('SELECT COUNT(*) FROM phone_alerts WHERE date = ?', (today,))
-    today_alerts = cursor.fetchone()[0]
+    cursor.execute('SELECT alerts FROM daily_alerts WHERE date = ?', (today,))
+    row = cursor.fetchone()
+    today_alerts = row[0] if row else 0
     
-    cursor.execute('SELECT COUNT(*) FROM sitting_sessions WHERE date = ?', (today,))
-    today_sitting = cursor.fetchone()[0]
+    cursor.execute('SELECT sessions FROM daily_sitting WHERE date = ?', (today,))
+    row = cursor.fetchone()
+    today_sitting = row[0] if row else 0
     
     conn.close()
     
-    return jsonify({
+    return json.dumps({
         "total_alerts": total_alerts,
         "total_sitting_sessions": total_sitting_sessions,
         "avg_sitting_duration": avg_sitting_duration,
         "today_alerts": today_alerts,
         "today_sitting": today_sitting,
-        "current_sitting": len([s for s in person_sessions.values() if s.get('status') == 'Sitting']),
+        "current_sitting": sum(camera.sitting_count() for camera in cameras.values()),
         "captures": alerts,
         "sitting_history": sitting
-    })
+    }).encode()
+
+def history_page(kind):
+    """Filtered, cursor-paginated rows of one history table as a response"""
+    try:
+        start, end = parse_date_range(request.args.get('start'), request.args.get('end'))
+        limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        filters = {name: request.args.get(name) for name in HISTORY_TABLES[kind]["filters"]}
+        
+        conn = sqlite3.connect(DATABASE_FILE)
+        try:
+            rows, next_cursor = query_page(conn, kind, filters, start, end, request.args.get('cursor'), limit)
+        finally:
+            conn.close()
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    
+    if kind == 'alerts':
+        for row in rows:
+            row["thumbnail"] = capture_store.thumbnail_for(row["filename"])
+    return jsonify({"items": rows, "next_cursor": next_cursor, "limit": limit})
+
+@app.route('/api/alerts')
+def get_alerts():
+    """?start=&end=&type=&person=&camera=&limit=&cursor="""
+    return history_page('alerts')
+
+@app.route('/api/sitting_sessions')
+def get_sitting_sessions():
+    """?start=&end=&person=&camera=&limit=&cursor="""
+    return history_page('sitting')
+
+def export_range():
+    """Validated ?start=&end= (YYYY-MM-DD, inclusive) of an export request"""
+    return parse_date_range(request.args.get('start'), request.args.get('end'))
+
+def export_filename(name, extension, start, end):
+    suffix = f"_{start or 'begin'}_to_{end or 'now'}" if start or end else ""
+    return f"visionguard_{name}{suffix}_{get_local_time().strftime('%Y%m%d_%H%M%S')}.{extension}"
 
 @app.route('/api/export/excel')
 def export_excel():
-    conn = sqlite3.connect(DATABASE_FILE)
-    cursor = conn.cursor()
-    
-    # Create workbook
-    wb = Workbook()
-    
-    # Phone Alerts Sheet
-    ws1 = wb.active
-    ws1.title = "Phone Alerts"
-    
-    # Headers
-    headers1 = ["ID", "Date", "Time", "Type", "Description", "Filename"]
-    ws1.append(headers1)
-    
-    # Style headers
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF")
-    for cell in ws1[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center")
-    
-    # Get data
-    cursor.execute('SELECT id, date, timestamp, type, description, filename FROM phone_alerts ORDER BY created_at DESC')
-    for row in cursor.fetchall():
-        ws1.append(row)
-    
-    # Sitting Sessions Sheet
-    ws2 = wb.create_sheet("Sitting Sessions")
-    headers2 = ["ID", "Person ID", "Date", "Time", "Duration (seconds)"]
-    ws2.append(headers2)
-    
-    # Style headers
-    for cell in ws2[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center")
-    
-    # Get data
-    cursor.execute('SELECT id, person_id, date, timestamp, duration FROM sitting_sessions ORDER BY created_at DESC')
-    for row in cursor.fetchall():
-        ws2.append(row)
-    
-    conn.close()
-    
-    # Save to BytesIO
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
+    """Both tables as a workbook, streamed; optional ?start=&end= dates"""
+    try:
+        start, end = export_range()
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    
+    # Include anything still queued for the database
+    db_writer.flush()
+    
+    filename = export_filename('export', 'xlsx', start, end)
+    response = Response(stream_xlsx(DATABASE_FILE, start, end),
+                        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+@app.route('/api/export/csv')
+def export_csv():
+    """One table (?table=alerts|sitting) as CSV, streamed; optional ?start=&end= dates"""
+    table = request.args.get('table', 'alerts')
+    if table not in EXPORT_TABLES:
+        return jsonify({"status": "error", "message": f"Unknown table: {table}"}), 400
+    try:
+        start, end = export_range()
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     
-    # Generate filename with timestamp
-    filename = f"visionguard_export_{get_local_time().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    db_writer.flush()
     
-    return send_file(
-        output,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        as_attachment=True,
-        download_name=filename
-    )
+    filename = export_filename(table, 'csv', start, end)
+    response = Response(stream_csv(DATABASE_FILE, table, start, end), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
 
-@app.route('/api/settings', methods=['POST'])
-def update_settings():
-    data = request.json
+def validate_settings(data):
+    """Checked and normalized setting changes; raises ValueError on any bad key.
+    
+    Nothing is applied here, so a rejected request changes no setting.
+    """
+    updates = {}
     if 'fps_limit' in data:
-        settings['fps_limit'] = int(data['fps_limit'])
+        updates['fps_limit'] = max(1, int(data['fps_limit']))
     if 'mode' in data:
-        settings['mode'] = data['mode']
-        settings['conf_threshold'] = 0.35 if data['mode'] == 'accurate' else 0.25
+        updates['mode'] = data['mode']
+        updates['conf_threshold'] = 0.35 if data['mode'] == 'accurate' else 0.25
     if 'low_light_mode' in data:
-        settings['low_light_mode'] = bool(data['low_light_mode'])
+        # true/false, or "auto" to enhance only while the scene is dark
+        if data['low_light_mode'] == LOW_LIGHT_AUTO:
+            updates['low_light_mode'] = LOW_LIGHT_AUTO
+        elif isinstance(data['low_light_mode'], str):
+            raise ValueError(f"Unknown low light mode: {data['low_light_mode']}")
+        else:
+            updates['low_light_mode'] = bool(data['low_light_mode'])
+    if 'motion_gating' in data:
+        updates['motion_gating'] = bool(data['motion_gating'])
+    if 'motion_threshold' in data:
+        updates['motion_threshold'] = max(1, min(255, int(data['motion_threshold'])))
+    if 'motion_min_area' in data:
+        updates['motion_min_area'] = max(0.0, float(data['motion_min_area']))
+    if 'motion_keepalive' in data:
+        updates['motion_keepalive'] = max(0.0, float(data['motion_keepalive']))
+    if 'motion_hold' in data:
+        updates['motion_hold'] = max(0.0, float(data['motion_hold']))
+    if 'target_latency_ms' in data:
+        updates['target_latency_ms'] = max(1.0, float(data['target_latency_ms']))
+    if 'min_detection_rate' in data:
+        updates['min_detection_rate'] = max(0.0, float(data['min_detection_rate']))
+    if 'headless' in data:
+        updates['headless'] = bool(data['headless'])
+    if 'pipeline' in data:
+        if data['pipeline'] not in PIPELINES:
+            raise ValueError(f"Unknown pipeline: {data['pipeline']}")
+        updates['pipeline'] = data['pipeline']
+    if 'batch_max_size' in data:
+        updates['batch_max_size'] = max(1, int(data['batch_max_size']))
+    if 'batch_max_wait_ms' in data:
+        updates['batch_max_wait_ms'] = max(0, float(data['batch_max_wait_ms']))
+    if 'tracker_method' in data:
+        if data['tracker_method'] not in ASSIGNMENT_METHODS:
+            raise ValueError(f"Unknown tracker method: {data['tracker_method']}")
+        updates['tracker_method'] = data['tracker_method']
+    if 'tracker_motion' in data:
+        updates['tracker_motion'] = bool(data['tracker_motion'])
+    if 'snapshot_format' in data:
+        if data['snapshot_format'] not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unknown snapshot format: {data['snapshot_format']}")
+        updates['snapshot_format'] = data['snapshot_format']
+    if 'snapshot_quality' in data:
+        updates['snapshot_quality'] = max(1, min(100, int(data['snapshot_quality'])))
+    if 'snapshot_thumbnail_width' in data:
+        updates['snapshot_thumbnail_width'] = max(0, int(data['snapshot_thumbnail_width']))
+    if 'capture_retention_days' in data:
+        updates['capture_retention_days'] = max(0, int(data['capture_retention_days']))
+    if 'capture_max_mb' in data:
+        updates['capture_max_mb'] = max(0, int(data['capture_max_mb']))
+    return updates
+
+def apply_settings():
+    """Push the current settings into every live component"""
+    capture_store.configure(max_age_days=settings['capture_retention_days'],
+                            max_bytes=settings['capture_max_mb'] * 1024 * 1024)
+    snapshot_writer.configure(image_format=settings['snapshot_format'],
+                              quality=settings['snapshot_quality'],
+                              thumbnail_width=settings['snapshot_thumbnail_width'])
+    for camera in cameras.values():
+        camera.tracker.configure(method=settings['tracker_method'], motion=settings['tracker_motion'])
+        camera.scheduler.configure(target_latency=settings['target_latency_ms'] / 1000.0,
+                                   min_detection_rate=settings['min_detection_rate'])
+        camera.motion.configure(pixel_threshold=settings['motion_threshold'],
+                                min_changed=settings['motion_min_area'],
+                                keepalive=settings['motion_keepalive'],
+                                hold=settings['motion_hold'])
+    inference_executor.configure(max_batch_size=settings['batch_max_size'],
+                                 max_wait=settings['batch_max_wait_ms'] / 1000.0)
+
+@app.route('/api/settings', methods=['POST'])
+def update_settings():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"status": "error", "message": "Expected a JSON object"}), 400
+    try:
+        updates = validate_settings(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    
+    if 'pipeline' in updates:
+        # Load the weights here, so a missing file is a 400 rather than an
+        # error inside every camera's inference call
+        try:
+            inference_stage.load_pipeline(updates['pipeline'])
+        except Exception as e:
+            return jsonify({"status": "error", "message": f"Cannot load pipeline {updates['pipeline']}: {e}"}), 400
+    
+    settings.update(updates)
+    apply_settings()
     return jsonify({"status": "success", "settings": settings})
 
 @app.route('/api/reset_db', methods=['POST'])
 def reset_db():
     try:
-        # Clear database tables
+        # Clear database tables (after any queued writes have landed)
+        db_writer.flush()
         conn = sqlite3.connect(DATABASE_FILE)
         cursor = conn.cursor()
         cursor.execute('DELETE FROM phone_alerts')
         cursor.execute('DELETE FROM sitting_sessions')
+        cursor.execute('DELETE FROM daily_alerts')
+        cursor.execute('DELETE FROM daily_sitting')
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate()
+        
+        # Clear captures and thumbnails (deleted in the background)
+        capture_store.clear()
         
-        # Clear captures folder
-        for filename in os.listdir(CAPTURE_FOLDER):
-            file_path = os.path.join(CAPTURE_FOLDER, filename)
-            try:
-                if os.path.isfile(file_path) or os.path.islink(file_path):
-                    os.unlink(file_path)
-            except Exception as e:
-                print(f'Failed to delete {file_path}. Reason: {e}')
-                
         # Clear in-memory lists
-        global captures, person_sessions, sitting_history
+        global captures, sitting_history
         captures = []
-        person_sessions = {}
         sitting_history = []
+        for camera in cameras.values():
+            camera.reset_sessions()
+        events.publish("reset", {})
+        publish_live_stats()
         
         return jsonify({"status": "success", "message": "Database and captures reset successfully"})
     except Exception as e:
@@ -900,7 +1140,12 @@ def reset_db():
 
 @app.route('/captures/<path:filename>')
 def serve_capture(filename):
-    return send_from_directory(CAPTURE_FOLDER, filename)
+    # Capture names are unique and never rewritten, so browsers can keep them
+    response = send_from_directory(CAPTURE_FOLDER, filename, max_age=CAPTURE_CACHE_SECONDS)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 if __name__ == '__main__':
+    start_cameras()
     app.run(host='0.0.0.0', port=2123, debug=False, threaded=True)
@@ -0,0 +1,69 @@
+"""Low-light enhancement cost per frame versus resolution.
+
+Compares the original apply_low_light_enhancement (new CLAHE every call,
+BGR->LAB->split->merge->BGR with fresh arrays) against the preprocessor's
+luma-only YCrCb path (cached CLAHE, reused buffers), and shows what the
+auto mode's brightness probe costs.
+
+Usage: python benchmarks/bench_low_light.py
+"""
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from preprocess import FramePreprocessor, frame_brightness
+
+RESOLUTIONS = [(480, 640), (720, 1280), (1080, 1920)]
+FRAMES = 50
+
+
+def apply_low_light_enhancement(frame):
+    """The original per-frame implementation, kept as the baseline"""
+    lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
+    l, a, b = cv2.split(lab)
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+    cl = clahe.apply(l)
+    limg = cv2.merge((cl,a,b))
+    return cv2.cvtColor(limg, cv2.COLOR_LAB2BGR)
+
+
+def dark_frame(rng, shape):
+    """Smooth, dim test image so CLAHE has real work to do"""
+    frame = rng.integers(0, 60, size=shape + (3,), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (9, 9), 3)
+
+
+def bench(fn, frame):
+    fn(frame)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        fn(frame)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':>12} {'original ms':>12} {'luma ms':>9} {'speedup':>8} {'probe ms':>9} {'mean diff':>10}")
+    for shape in RESOLUTIONS:
+        frame = dark_frame(rng, shape)
+        preprocessor = FramePreprocessor()
+
+        original_ms = bench(apply_low_light_enhancement, frame)
+        luma_ms = bench(preprocessor.enhance_low_light, frame)
+        probe_ms = bench(frame_brightness, frame)
+
+        # LAB L* and YCrCb Y are different lumas, so outputs differ slightly
+        diff = np.abs(apply_low_light_enhancement(frame).astype(np.int16)
+                      - preprocessor.enhance_low_light(frame).astype(np.int16)).mean()
+        resolution = f"{shape[1]}x{shape[0]}"
+        print(f"{resolution:>12} {original_ms:>12.3f} {luma_ms:>9.3f} "
+              f"{original_ms / luma_ms:>7.1f}x {probe_ms:>9.3f} {diff:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Per-frame timer card cost versus person count.
+
+Compares drawing each card with draw_timer_card (full-frame copy and blend
+per card) against the OverlayCompositor (cached sprites, ROI-only blend).
+
+Usage: python benchmarks/bench_overlay.py
+"""
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from overlay import OverlayCompositor
+
+RESOLUTIONS = [(480, 640), (720, 1280)]
+PERSON_COUNTS = [1, 5, 10, 20]
+FRAMES = 100
+
+
+# The original per-card implementation, kept as the baseline
+
+def draw_timer_card(frame, x, y, timer_text, status="SITTING"):
+    """Draw glassmorphism timer card"""
+    padding = 20
+    text_size = cv2.getTextSize(timer_text, cv2.FONT_HERSHEY_SIMPLEX, 0.9, 2)[0]
+    label_size = cv2.getTextSize(status, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
+    
+    card_width = max(text_size[0], label_size[0]) + padding * 2
+    card_height = 70
+    
+    card_x = x - card_width // 2
+    card_y = y - 100
+    
+    card_x = max(10, min(card_x, frame.shape[1] - card_width - 10))
+    card_y = max(10, card_y)
+    
+    overlay = frame.copy()
+    
+    cv2.rectangle(overlay, 
+                 (card_x, card_y), 
+                 (card_x + card_width, card_y + card_height),
+                 (20, 20, 20), -1)
+    
+    cv2.rectangle(overlay, 
+                 (card_x, card_y), 
+                 (card_x + card_width, card_y + card_height),
+                 (100, 100, 100), 2)
+    
+    alpha = 0.75
+    cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
+    
+    # Color based on status
+    # Orange for Sitting, Blue for Standing
+    color = (255, 149, 0) if status == "SITTING" else (0, 149, 255)
+    
+    cv2.rectangle(frame,
+                 (card_x, card_y),
+                 (card_x + card_width, card_y + 4),
+                 color, -1)
+    
+    label_x = card_x + (card_width - label_size[0]) // 2
+    cv2.putText(frame, status, 
+               (label_x, card_y + 25),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1)
+    
+    timer_x = card_x + (card_width - text_size[0]) // 2
+    cv2.putText(frame, timer_text,
+               (timer_x, card_y + 55),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+
+
+
+def make_cards(rng, count, shape):
+    cards = []
+    for _ in range(count):
+        seconds = int(rng.integers(0, 600))
+        text = f"{seconds // 60}m {seconds % 60}s" if seconds >= 60 else f"{seconds}s"
+        status = "SITTING" if rng.random() < 0.5 else "STANDING"
+        cards.append((int(rng.integers(0, shape[1])), int(rng.integers(100, shape[0])), text, status))
+    return cards
+
+
+def bench_reference(frame, cards):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        target = frame.copy()
+        for x, y, text, status in cards:
+            draw_timer_card(target, x, y, text, status)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def bench_compositor(frame, cards):
+    compositor = OverlayCompositor()
+    compositor.draw_cards(frame.copy(), cards)  # warm the sprite cache, as in steady state
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        target = frame.copy()
+        compositor.draw_cards(target, cards)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':>12} {'people':>7} {'per-card ms':>12} {'compositor ms':>14} {'speedup':>8}")
+    for shape in RESOLUTIONS:
+        frame = rng.integers(0, 255, size=shape + (3,), dtype=np.uint8)
+        for count in PERSON_COUNTS:
+            cards = make_cards(rng, count, shape)
+            reference_ms = bench_reference(frame, cards)
+            compositor_ms = bench_compositor(frame, cards)
+            resolution = f"{shape[1]}x{shape[0]}"
+            print(f"{resolution:>12} {count:>7} {reference_ms:>12.3f} {compositor_ms:>14.3f} "
+                  f"{reference_ms / compositor_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""Compare the posture engine with the original per-person functions.
+
+Usage: python benchmarks/bench_posture.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from posture import analyze_postures, postures_per_person, postures_vectorized
+
+CROWD_SIZES = [1, 4, 10, 100]
+PHONES = 3
+REPEATS = 200
+
+
+# The original per-person functions, kept as the baseline
+
+def calculate_angle(a, b, c):
+    """Calculate angle between three points."""
+    a = np.array(a)
+    b = np.array(b)
+    c = np.array(c)
+    
+    radians = np.arctan2(c[1]-b[1], c[0]-b[0]) - np.arctan2(a[1]-b[1], a[0]-b[0])
+    angle = np.abs(radians*180.0/np.pi)
+    
+    if angle > 180.0:
+        angle = 360 - angle
+        
+    return angle
+
+
+def calculate_iou(box1, box2):
+    """Calculate Intersection over Union between two bounding boxes"""
+    x1_min, y1_min, x1_max, y1_max = box1
+    x2_min, y2_min, x2_max, y2_max = box2
+    
+    inter_x_min = max(x1_min, x2_min)
+    inter_y_min = max(y1_min, y2_min)
+    inter_x_max = min(x1_max, x2_max)
+    inter_y_max = min(y1_max, y2_max)
+    
+    if inter_x_max < inter_x_min or inter_y_max < inter_y_min:
+        return 0.0
+    
+    inter_area = (inter_x_max - inter_x_min) * (inter_y_max - inter_y_min)
+    
+    box1_area = (x1_max - x1_min) * (y1_max - y1_min)
+    box2_area = (x2_max - x2_min) * (y2_max - y2_min)
+    union_area = box1_area + box2_area - inter_area
+    
+    if union_area == 0:
+        return 0.0
+    
+    return inter_area / union_area
+
+
+def get_person_bbox(keypoints):
+    """Get bounding box from keypoints"""
+    valid_points = keypoints[keypoints[:, 0] > 0]
+    if len(valid_points) == 0:
+        return None
+    
+    x_min = valid_points[:, 0].min()
+    y_min = valid_points[:, 1].min()
+    x_max = valid_points[:, 0].max()
+    y_max = valid_points[:, 1].max()
+    
+    return [x_min, y_min, x_max, y_max]
+
+
+def check_head_down(keypoints):
+    """Check if head is looking down"""
+    if len(keypoints) > 6:
+        nose = keypoints[0][:2]
+        left_eye = keypoints[1][:2]
+        right_eye = keypoints[2][:2]
+        left_shoulder = keypoints[5][:2]
+        right_shoulder = keypoints[6][:2]
+        
+        if all([nose[0] > 0, left_eye[0] > 0, right_eye[0] > 0, 
+                left_shoulder[0] > 0, right_shoulder[0] > 0]):
+            
+            eye_y = (left_eye[1] + right_eye[1]) / 2
+            shoulder_y = (left_shoulder[1] + right_shoulder[1]) / 2
+            nose_to_eye_dist = nose[1] - eye_y
+            eye_to_shoulder_dist = shoulder_y - eye_y
+            
+            if eye_to_shoulder_dist > 0:
+                ratio = nose_to_eye_dist / eye_to_shoulder_dist
+                if ratio > 0.3:
+                    return True
+    
+    return False
+
+
+def check_sitting_advanced(keypoints, chairs_boxes):
+    """Advanced sitting detection"""
+    if len(keypoints) < 17:
+        return "Standing", 0
+    
+    left_hip = keypoints[11][:2]
+    right_hip = keypoints[12][:2]
+    left_knee = keypoints[13][:2]
+    right_knee = keypoints[14][:2]
+    left_ankle = keypoints[15][:2]
+    right_ankle = keypoints[16][:2]
+    left_shoulder = keypoints[5][:2]
+    right_shoulder = keypoints[6][:2]
+    
+    hip_x = (left_hip[0] + right_hip[0]) / 2
+    hip_y = (left_hip[1] + right_hip[1]) / 2
+    
+    sitting_score = 0
+    knee_angle = 0
+    
+    if all([left_hip[0] > 0, left_knee[0] > 0, left_ankle[0] > 0]):
+        left_angle = calculate_angle(left_hip, left_knee, left_ankle)
+        if 60 < left_angle < 120:
+            sitting_score += 1
+            knee_angle = left_angle
+    
+    if all([right_hip[0] > 0, right_knee[0] > 0, right_ankle[0] > 0]):
+        right_angle = calculate_angle(right_hip, right_knee, right_ankle)
+        if 60 < right_angle < 120:
+            sitting_score += 1
+            if knee_angle == 0:
+                knee_angle = right_angle
+    
+    if left_knee[0] > 0 and right_knee[0] > 0:
+        avg_knee_y = (left_knee[1] + right_knee[1]) / 2
+        hip_knee_diff = hip_y - avg_knee_y
+        
+        if -50 < hip_knee_diff < 100:
+            sitting_score += 1
+    
+    if all([left_shoulder[0] > 0, right_shoulder[0] > 0, hip_x > 0]):
+        shoulder_y = (left_shoulder[1] + right_shoulder[1]) / 2
+        torso_vertical_dist = hip_y - shoulder_y
+        shoulder_x = (left_shoulder[0] + right_shoulder[0]) / 2
+        torso_horizontal_dist = abs(hip_x - shoulder_x)
+        
+        if torso_vertical_dist > 0 and torso_horizontal_dist < torso_vertical_dist * 0.5:
+            sitting_score += 1
+    
+    if sitting_score >= 2:
+        # If pose strongly suggests sitting, we don't strictly need a chair
+        return "Sitting", knee_angle
+    
+    return "Standing", 0
+
+
+def check_phone_in_hand(keypoints, phone_boxes):
+    """Check if phone is near wrists (simulating Phone-Hand class)"""
+    if len(keypoints) < 17:
+        return False
+        
+    l_wrist = keypoints[9][:2]
+    r_wrist = keypoints[10][:2]
+    
+    for box in phone_boxes:
+        x1, y1, x2, y2 = box
+        # Expand box slightly for wrist tolerance
+        margin = 40
+        
+        # Check Left Wrist
+        if l_wrist[0] > 0:
+            if (x1 - margin <= l_wrist[0] <= x2 + margin) and (y1 - margin <= l_wrist[1] <= y2 + margin):
+                return True
+                
+        # Check Right Wrist
+        if r_wrist[0] > 0:
+            if (x1 - margin <= r_wrist[0] <= x2 + margin) and (y1 - margin <= r_wrist[1] <= y2 + margin):
+                return True
+                
+    return False
+
+
+
+def make_crowd(rng, people):
+    """Random but plausible keypoints: a person-sized cloud with some joints missing"""
+    origin = rng.uniform(0, 1200, size=(people, 1, 2))
+    offsets = rng.uniform(0, 1, size=(people, 17, 2)) * [120, 300]
+    keypoints = np.concatenate([origin + offsets, rng.uniform(0.3, 1, size=(people, 17, 1))], axis=2)
+    missing = rng.random((people, 17)) < 0.1
+    keypoints[missing] = 0
+    return keypoints.astype(np.float32)
+
+
+def make_phones(rng, count):
+    corners = rng.uniform(0, 1200, size=(count, 2))
+    return np.hstack([corners, corners + 40]).astype(np.float32)
+
+
+def per_person(keypoints, phone_boxes):
+    results = []
+    for kps in keypoints:
+        status, angle = check_sitting_advanced(kps, [])
+        bbox = get_person_bbox(kps)
+        holding = check_phone_in_hand(kps, phone_boxes)
+        nearby = bbox is not None and any(calculate_iou(bbox, box) > 0.01 for box in phone_boxes)
+        results.append((status == "Sitting", angle, check_head_down(kps), holding, nearby))
+    return results
+
+
+def check_agreement(keypoints, phone_boxes):
+    reference = per_person(keypoints, phone_boxes)
+    engine = analyze_postures(keypoints, phone_boxes)
+    for i, (sitting, angle, head_down, holding, nearby) in enumerate(reference):
+        assert engine["sitting"][i] == sitting, i
+        assert abs(engine["knee_angle"][i] - angle) < 1e-3, i
+        assert engine["head_down"][i] == head_down, i
+        assert engine["phone_in_hand"][i] == holding, i
+        assert engine["phone_nearby"][i] == nearby, i
+
+    # The small-crowd path must report exactly what the array path does
+    small = postures_per_person(keypoints, phone_boxes)
+    large = postures_vectorized(keypoints, phone_boxes)
+    for key, values in large.items():
+        assert np.allclose(small[key], values, atol=1e-3), key
+
+
+def timeit(fn, *args):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'people':>8} {'per-person ms':>15} {'engine ms':>15} {'speedup':>9}")
+    for people in CROWD_SIZES:
+        keypoints = make_crowd(rng, people)
+        phone_boxes = make_phones(rng, PHONES)
+        check_agreement(keypoints, phone_boxes)
+
+        scalar_ms = timeit(per_person, keypoints, phone_boxes)
+        vector_ms = timeit(analyze_postures, keypoints, phone_boxes)
+        print(f"{people:>8} {scalar_ms:>15.3f} {vector_ms:>15.3f} {scalar_ms / vector_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import json
+import os
+
+import cv2
+
+DEFAULT_CAMERAS = [
+    {"id": "0", "name": "Camera 0", "source": 0, "motion_regions": None}
+]
+
+
+def load_camera_registry(path):
+    """Load the list of cameras from a JSON config file.
+
+    Each entry has an "id", an optional "name" and a "source", which is
+    either a device index (0, 1, ...), an RTSP/HTTP URL or a video file path.
+    "motion_regions" optionally limits motion gating to a list of polygons
+    in 0-1 frame coordinates.
+    Falls back to the local webcam when the file does not exist.
+    """
+    if not os.path.exists(path):
+        print(f"Camera config not found: {path}, using default camera")
+        return [dict(cam) for cam in DEFAULT_CAMERAS]
+
+    with open(path) as f:
+        config = json.load(f)
+
+    registry = []
+    seen_ids = set()
+    for entry in config.get("cameras", []):
+        camera_id = str(entry["id"])
+        if camera_id in seen_ids:
+            raise ValueError(f"Duplicate camera id in {path}: {camera_id}")
+        seen_ids.add(camera_id)
+        registry.append({
+            "id": camera_id,
+            "name": entry.get("name", f"Camera {camera_id}"),
+            "source": entry["source"],
+            "motion_regions": entry.get("motion_regions")
+        })
+
+    if not registry:
+        raise ValueError(f"No cameras configured in {path}")
+
+    print(f"Total cameras configured: {len(registry)}")
+    return registry
+
+
+def is_live_source(source):
+    """Device indices and stream URLs can be reopened after a drop; files just end"""
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        return True
+    return isinstance(source, str) and "://" in source
+
+
+def open_camera_source(source):
+    """Open a device index, stream URL or video file with OpenCV"""
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    if isinstance(source, str) and source.startswith(("rtsp://", "rtsps://")):
+        return cv2.VideoCapture(source, cv2.CAP_FFMPEG)
+    return cv2.VideoCapture(source)
@@ -0,0 +1,136 @@
+import collections
+import threading
+import time
+
+import cv2
+
+# Frame rate assumed for a paced source that does not report one
+DEFAULT_SOURCE_FPS = 30.0
+
+
+class CameraGrabber:
+    """Continuously drain a capture device into a small ring buffer.
+
+    The driver queue is emptied as fast as the camera delivers frames, so the
+    consumer always gets the newest frame instead of one that sat in the
+    V4L2 queue while inference was running.
+
+    A video file has no such queue and decodes far faster than real time,
+    so with pace=True reads are spaced at the source's own frame rate and
+    the file plays back at normal speed instead of fast-forwarding.
+    """
+
+    def __init__(self, capture, buffer_size=2, pace=False):
+        self.capture = capture
+        self.pace = pace
+        self._buffer = collections.deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._seq = 0
+        self._last_read_seq = 0
+        self.running = False
+        self.failed = False
+
+        # Counters
+        self.frames_grabbed = 0
+        self.frames_dropped = 0   # evicted from the ring before anyone read them
+        self.frames_skipped = 0   # never handed to the consumer
+        self.last_frame_age = 0.0
+
+        # Keep the driver-side queue as short as the backend allows
+        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.running = True
+        self.failed = False
+        self._thread = threading.Thread(target=self._run, name="camera-grabber", daemon=True)
+        self._thread.start()
+
+    def replace_capture(self, capture):
+        """Swap in a freshly opened device after a failure (grab thread stopped)"""
+        self.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.capture.release()
+        self.capture = capture
+        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.failed = False
+
+    def stop(self):
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+
+    def _frame_interval(self):
+        """Seconds between reads for a paced source, 0 for an unpaced one"""
+        if not self.pace:
+            return 0.0
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        if not fps or fps != fps or fps <= 0:
+            fps = DEFAULT_SOURCE_FPS
+        return 1.0 / fps
+
+    def _run(self):
+        interval = self._frame_interval()
+        next_read = time.time()
+        while self.running:
+            if interval:
+                delay = next_read - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                # After a stall, carry on from now rather than catching up
+                next_read = max(next_read, time.time() - interval) + interval
+            success, frame = self.capture.read()
+            with self._cond:
+                if not success:
+                    self.failed = True
+                    self.running = False
+                    self._cond.notify_all()
+                    break
+
+                self._seq += 1
+                self.frames_grabbed += 1
+                if len(self._buffer) == self._buffer.maxlen and self._buffer[0][0] > self._last_read_seq:
+                    self.frames_dropped += 1
+                self._buffer.append((self._seq, time.time(), frame))
+                self._cond.notify_all()
+
+    def read_latest(self, not_before=None, timeout=1.0):
+        """Return the newest unseen (seq, timestamp, frame), or None.
+
+        If not_before is given the call waits until that time before picking
+        a frame, which paces the consumer without making the chosen frame any
+        older. Returns None on timeout or when the device has failed.
+        """
+        deadline = time.time() + timeout
+        if not_before is not None:
+            deadline = max(deadline, not_before + timeout)
+
+        with self._cond:
+            while True:
+                now = time.time()
+                ready = self._seq > self._last_read_seq
+                if self.failed and not ready:
+                    return None
+                if ready and (not_before is None or now >= not_before):
+                    break
+                if now >= deadline:
+                    return None
+                wake_at = deadline if not ready or not_before is None else min(deadline, not_before)
+                self._cond.wait(max(0.0, wake_at - now))
+
+            seq, timestamp, frame = self._buffer[-1]
+            self.frames_skipped += seq - self._last_read_seq - 1
+            self._last_read_seq = seq
+            self.last_frame_age = time.time() - timestamp
+            return seq, timestamp, frame
+
+    def stats(self):
+        return {
+            "frames_grabbed": self.frames_grabbed,
+            "frames_dropped": self.frames_dropped,
+            "frames_skipped": self.frames_skipped,
+            "frame_age_ms": int(self.last_frame_age * 1000)
+        }
@@ -0,0 +1,238 @@
+import datetime
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+
+# Day shards are YYYY/MM/DD below the capture folder
+DAY_SHARD = re.compile(r"^\d{4}/\d{2}/\d{2}$")
+
+# Captured images never change, so browsers may keep them for a year
+CAPTURE_CACHE_SECONDS = 365 * 24 * 3600
+
+TRASH_PREFIX = ".trash-"
+
+
+def folder_size(path):
+    """(files, bytes) below path"""
+    files = 0
+    total = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+                files += 1
+            except OSError:
+                pass
+    return files, total
+
+
+class CaptureStore:
+    """Where alert snapshots live and how long they are kept.
+
+    Captures go to day shards (captures/YYYY/MM/DD/, thumbnails mirrored
+    under thumbs/) with a random suffix, so names never collide and no
+    directory grows without bound. A background thread deletes whole days
+    older than max_age_days, then the oldest days (and, within the current
+    day, the oldest files) while usage exceeds max_bytes. Files from the
+    old flat layout count as the oldest day. Database rows are kept; only
+    the images expire. local_time returns the current datetime in the
+    timezone the shards are named in.
+    """
+
+    def __init__(self, folder, thumbnail_folder, max_age_days=30, max_bytes=0, prune_interval=600.0,
+                 local_time=datetime.datetime.now):
+        self.folder = folder
+        self.thumbnail_folder = thumbnail_folder
+        self.local_time = local_time
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.prune_interval = prune_interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._made_dirs = set()
+        self._thread = None
+
+        # Usage, kept current between scans as snapshots are written
+        self.files = 0
+        self.bytes = 0
+
+        # Metrics
+        self.pruned_files = 0
+        self.pruned_bytes = 0
+        self.last_prune_latency = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="capture-pruner", daemon=True)
+            self._thread.start()
+
+    def configure(self, max_age_days=None, max_bytes=None):
+        if max_age_days is not None:
+            self.max_age_days = max(0, int(max_age_days))
+        if max_bytes is not None:
+            self.max_bytes = max(0, int(max_bytes))
+        self._wake.set()
+
+    def new_path(self, camera_id, local_time, extension):
+        """Fresh relative path for a capture, creating its day shard"""
+        shard = local_time.strftime("%Y/%m/%d")
+        if shard not in self._made_dirs:
+            os.makedirs(os.path.join(self.folder, shard), exist_ok=True)
+            os.makedirs(os.path.join(self.thumbnail_folder, shard), exist_ok=True)
+            self._made_dirs.add(shard)
+        stamp = local_time.strftime("%Y%m%d_%H%M%S")
+        return f"{shard}/capture_{camera_id}_{stamp}_{uuid.uuid4().hex[:8]}{extension}"
+
+    def thumbnail_for(self, filename):
+        """Path of a capture's thumbnail, relative to the capture folder"""
+        return os.path.relpath(os.path.join(self.thumbnail_folder, filename), self.folder).replace(os.sep, "/")
+
+    def record(self, filename, nbytes, files=1):
+        """Count newly written files (SnapshotWriter's on_written hook)"""
+        with self._lock:
+            self.files += files
+            self.bytes += nbytes
+            over = self.max_bytes and self.bytes > self.max_bytes
+        if over:
+            self._wake.set()
+
+    def _day_shards(self, root):
+        """Day shard names below root, oldest first"""
+        shards = []
+        for year in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+            if not year.isdigit():
+                continue
+            for month in sorted(os.listdir(os.path.join(root, year))):
+                month_path = os.path.join(root, year, month)
+                if not os.path.isdir(month_path):
+                    continue
+                for day in sorted(os.listdir(month_path)):
+                    shard = f"{year}/{month}/{day}"
+                    if DAY_SHARD.match(shard):
+                        shards.append(shard)
+        return shards
+
+    def _legacy_files(self):
+        """Captures from the old flat layout, oldest first"""
+        entries = []
+        for folder in (self.folder, self.thumbnail_folder):
+            if not os.path.isdir(folder):
+                continue
+            with os.scandir(folder) as it:
+                entries.extend(entry for entry in it if entry.is_file())
+        return sorted(entries, key=lambda entry: entry.stat().st_mtime)
+
+    def _remove_file(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+        except OSError:
+            return
+        with self._lock:
+            self.files -= 1
+            self.bytes -= size
+            self.pruned_files += 1
+            self.pruned_bytes += size
+
+    def _remove_shard(self, shard):
+        for root in (self.folder, self.thumbnail_folder):
+            path = os.path.join(root, shard)
+            files, size = folder_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+            with self._lock:
+                self.files -= files
+                self.bytes -= size
+                self.pruned_files += files
+                self.pruned_bytes += size
+        self._made_dirs.discard(shard)
+
+    def _over_budget(self):
+        return self.max_bytes and self.bytes > self.max_bytes
+
+    def scan(self):
+        """Recount usage from disk"""
+        files, total = folder_size(self.folder)
+        with self._lock:
+            self.files = files
+            self.bytes = total
+
+    def prune(self):
+        """Apply the age limit, then the size limit"""
+        started = now = time.time()
+        cutoff = (self.local_time() - datetime.timedelta(days=self.max_age_days)).strftime("%Y/%m/%d")
+
+        legacy = self._legacy_files()
+        for entry in legacy:
+            expired = self.max_age_days and entry.stat().st_mtime < now - self.max_age_days * 86400
+            if expired or self._over_budget():
+                self._remove_file(entry.path)
+
+        shards = self._day_shards(self.folder)
+        for shard in shards[:-1]:
+            if (self.max_age_days and shard < cutoff) or self._over_budget():
+                self._remove_shard(shard)
+        if shards and self.max_age_days and shards[-1] < cutoff:
+            self._remove_shard(shards[-1])
+        elif shards and self._over_budget():
+            # Only the newest day is left: drop its oldest captures
+            with os.scandir(os.path.join(self.folder, shards[-1])) as it:
+                entries = sorted(it, key=lambda entry: entry.stat().st_mtime)
+            for entry in entries:
+                if not self._over_budget():
+                    break
+                self._remove_file(entry.path)
+                self._remove_file(os.path.join(self.thumbnail_folder, shards[-1], entry.name))
+
+        self.last_prune_latency = time.time() - started
+
+    def clear(self):
+        """Delete every capture; returns at once, files go in the background.
+
+        Top-level entries are renamed into a trash folder, which is then
+        removed by a background thread.
+        """
+        trash = os.path.join(self.folder, f"{TRASH_PREFIX}{uuid.uuid4().hex[:8]}")
+        os.makedirs(trash)
+        thumbs_name = os.path.relpath(self.thumbnail_folder, self.folder)
+        for name in os.listdir(self.folder):
+            if name.startswith(TRASH_PREFIX) or name == thumbs_name:
+                continue
+            os.rename(os.path.join(self.folder, name), os.path.join(trash, name))
+        if os.path.isdir(self.thumbnail_folder):
+            os.rename(self.thumbnail_folder, os.path.join(trash, thumbs_name))
+        os.makedirs(self.thumbnail_folder, exist_ok=True)
+        with self._lock:
+            self.files = 0
+            self.bytes = 0
+            self._made_dirs.clear()
+        threading.Thread(target=shutil.rmtree, args=(trash, True), name="capture-clear", daemon=True).start()
+
+    def _run(self):
+        # Leftovers of a clear() interrupted by a restart
+        for name in os.listdir(self.folder):
+            if name.startswith(TRASH_PREFIX):
+                shutil.rmtree(os.path.join(self.folder, name), ignore_errors=True)
+        self.scan()
+        while True:
+            try:
+                self.prune()
+            except Exception as e:
+                print(f"Capture pruning failed: {e}")
+            self._wake.wait(self.prune_interval)
+            self._wake.clear()
+
+    def stats(self):
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "max_age_days": self.max_age_days,
+            "max_bytes": self.max_bytes,
+            "pruned_files": self.pruned_files,
+            "pruned_bytes": self.pruned_bytes,
+            "last_prune_ms": round(self.last_prune_latency * 1000, 2)
+        }
@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+from collections import deque
+
+# Comment line sent to idle clients so proxies keep the connection open
+HEARTBEAT_INTERVAL = 15.0
+
+# Events kept for clients that reconnect with Last-Event-ID
+HISTORY_SIZE = 200
+
+
+def format_event(seq, event, data):
+    """One Server-Sent Events message, serialized once for every client"""
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventBus:
+    """Push live updates to any number of Server-Sent Events clients.
+
+    The pipeline publishes two kinds of events. State events (live stats)
+    are only sent when their data changed, at most once per min_interval,
+    and the latest value is replayed to every new client. Discrete events
+    (a new alert, a finished sitting session) are sent once and kept in a
+    short history, so a client that reconnects with Last-Event-ID gets
+    what it missed. Each message is formatted once and shared by all
+    subscribers, and publishing never waits for a slow client.
+    """
+
+    def __init__(self, history=HISTORY_SIZE, heartbeat=HEARTBEAT_INTERVAL):
+        self.heartbeat = heartbeat
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._history = deque(maxlen=history)   # (seq, message)
+        self._state = {}                         # event -> (data, message)
+        self._state_published_at = {}
+        self.subscribers = 0
+
+        # Metrics
+        self.published = 0
+        self.suppressed = 0
+
+    def publish(self, event, data):
+        with self._cond:
+            self._append(event, data)
+
+    def publish_state(self, event, data, min_interval=0.0):
+        """Publish data for a state event unless it is unchanged or too soon.
+
+        Returns whether it was sent. A change held back by min_interval goes
+        out on a later call.
+        """
+        now = time.time()
+        with self._cond:
+            current = self._state.get(event)
+            if current is not None and current[0] == data:
+                self.suppressed += 1
+                return False
+            if now - self._state_published_at.get(event, float("-inf")) < min_interval:
+                return False
+            message = self._append(event, data)
+            self._state[event] = (data, message)
+            self._state_published_at[event] = now
+            return True
+
+    def _append(self, event, data):
+        self._seq += 1
+        message = format_event(self._seq, event, data)
+        self._history.append((self._seq, message))
+        self.published += 1
+        self._cond.notify_all()
+        return message
+
+    def _messages_after(self, seq):
+        return [(s, message) for s, message in self._history if s > seq]
+
+    def subscribe(self, last_event_id=None):
+        """SSE generator for one client.
+
+        A new client first gets the current value of every state event. A
+        reconnecting client instead gets the history it missed, if it is
+        still held.
+        """
+        with self._cond:
+            self.subscribers += 1
+            resumable = (last_event_id is not None and self._history and
+                         self._history[0][0] <= last_event_id + 1 and last_event_id <= self._seq)
+            if resumable:
+                pending = [message for _, message in self._messages_after(last_event_id)]
+            else:
+                pending = [message for _, message in self._state.values()]
+            last_seq = self._seq
+        try:
+            if pending:
+                yield "".join(pending)
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._seq != last_seq, self.heartbeat)
+                    messages = self._messages_after(last_seq)
+                    last_seq = self._seq
+                yield "".join(message for _, message in messages) if messages else ": keepalive\n\n"
+        finally:
+            with self._cond:
+                self.subscribers -= 1
+
+    def stats(self):
+        return {
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "suppressed": self.suppressed,
+            "last_event_id": self._seq
+        }
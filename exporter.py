@@ -0,0 +1,118 @@
+import csv
+import datetime
+import io
+import sqlite3
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill
+
+# Rows pulled from the cursor at a time
+EXPORT_CHUNK_ROWS = 1000
+
+# Bytes per chunk when streaming a finished workbook
+EXPORT_STREAM_CHUNK = 64 * 1024
+
+EXPORT_TABLES = {
+    "alerts": {
+        "title": "Phone Alerts",
+        "headers": ["ID", "Date", "Time", "Type", "Description", "Filename", "Camera", "Person"],
+        "sql": 'SELECT id, date, timestamp, type, description, filename, camera_id, person_name FROM phone_alerts'
+    },
+    "sitting": {
+        "title": "Sitting Sessions",
+        "headers": ["ID", "Person ID", "Date", "Time", "Duration (seconds)", "Camera", "Person"],
+        "sql": 'SELECT id, person_id, date, timestamp, duration, camera_id, person_name FROM sitting_sessions'
+    }
+}
+
+
+def parse_date_range(start=None, end=None):
+    """Validate optional YYYY-MM-DD bounds (inclusive); raises ValueError"""
+    for value in (start, end):
+        if value:
+            datetime.datetime.strptime(value, "%Y-%m-%d")
+    if start and end and start > end:
+        raise ValueError(f"start ({start}) is after end ({end})")
+    return start or None, end or None
+
+
+def iter_rows(conn, table, start=None, end=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Rows of one export table, newest first, fetched chunk_rows at a time"""
+    sql = EXPORT_TABLES[table]["sql"]
+    conditions = []
+    params = []
+    if start:
+        conditions.append('date >= ?')
+        params.append(start)
+    if end:
+        conditions.append('date <= ?')
+        params.append(end)
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
+    sql += ' ORDER BY created_at DESC, id DESC'
+
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            break
+        yield from rows
+
+
+def stream_csv(database_file, table, start=None, end=None):
+    """CSV of one table, yielded a chunk of rows at a time"""
+    conn = sqlite3.connect(database_file)
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_TABLES[table]["headers"])
+        for count, row in enumerate(iter_rows(conn, table, start, end), 1):
+            writer.writerow(row)
+            if count % EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    finally:
+        conn.close()
+
+
+def stream_xlsx(database_file, start=None, end=None):
+    """Workbook with one sheet per table, yielded in EXPORT_STREAM_CHUNK pieces.
+
+    A write-only workbook keeps memory flat however many rows there are:
+    rows go straight to temporary XML, and the zipped result is spooled to
+    a temporary file that is then streamed out.
+    """
+    conn = sqlite3.connect(database_file)
+    try:
+        wb = Workbook(write_only=True)
+        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF")
+        header_alignment = Alignment(horizontal="center")
+
+        for table, spec in EXPORT_TABLES.items():
+            ws = wb.create_sheet(spec["title"])
+            header = []
+            for title in spec["headers"]:
+                cell = WriteOnlyCell(ws, value=title)
+                cell.fill = header_fill
+                cell.font = header_font
+                cell.alignment = header_alignment
+                header.append(cell)
+            ws.append(header)
+            for row in iter_rows(conn, table, start, end):
+                ws.append(row)
+    finally:
+        conn.close()
+
+    with tempfile.TemporaryFile() as output:
+        wb.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(EXPORT_STREAM_CHUNK)
+            if not chunk:
+                break
+            yield chunk
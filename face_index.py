@@ -0,0 +1,132 @@
+import threading
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+ENCODING_SIZE = 128
+DEFAULT_TOLERANCE = 0.6
+
+# Switch to the approximate index once the gallery holds this many encodings
+ANN_THRESHOLD = 5000
+# Candidates fetched from the approximate index before exact re-ranking
+ANN_CANDIDATES = 32
+
+
+class FaceGallery:
+    """Enrolled face encodings stored as one contiguous float32 matrix.
+
+    An identity may have several encodings (e.g. photos from different
+    angles); its distance to a face is the smallest over all of them. All
+    faces in a frame are matched against the whole gallery in one matrix
+    operation. Past ANN_THRESHOLD encodings, and if faiss is installed, an
+    HNSW index narrows the search before exact re-ranking.
+    """
+
+    def __init__(self, tolerance=DEFAULT_TOLERANCE, ann_threshold=ANN_THRESHOLD):
+        self.tolerance = tolerance
+        self.ann_threshold = ann_threshold
+        self.names = []                                  # one per identity
+        self.encodings = np.zeros((0, ENCODING_SIZE), dtype=np.float32)
+        self.identity = np.zeros((0,), dtype=np.int32)   # identity of each encoding row
+        self._sq_norms = np.zeros((0,), dtype=np.float32)
+        self._ann = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.encodings)
+
+    @property
+    def identity_count(self):
+        return len(self.names)
+
+    def replace(self, entries):
+        """Rebuild the gallery from (name, encoding) pairs in one go"""
+        names = []
+        name_index = {}
+        identity = []
+        encodings = []
+        for name, encoding in entries:
+            if name not in name_index:
+                name_index[name] = len(names)
+                names.append(name)
+            identity.append(name_index[name])
+            encodings.append(np.asarray(encoding, dtype=np.float32))
+
+        matrix = np.ascontiguousarray(np.vstack(encodings) if encodings
+                                      else np.zeros((0, ENCODING_SIZE)), dtype=np.float32)
+        ann = self._build_ann(matrix)
+
+        # Swap everything at once so matching threads never see a half-built gallery
+        with self._lock:
+            self.names = names
+            self.encodings = matrix
+            self.identity = np.asarray(identity, dtype=np.int32)
+            self._sq_norms = (matrix ** 2).sum(axis=1)
+            self._ann = ann
+
+    def _build_ann(self, matrix):
+        if faiss is None or len(matrix) < self.ann_threshold:
+            return None
+        index = faiss.IndexHNSWFlat(ENCODING_SIZE, 32)
+        index.add(matrix)
+        return index
+
+    def match(self, face_encodings, top_k=1):
+        """Match every face in a frame against the gallery.
+
+        Returns one list per face of up to top_k (name, distance) pairs,
+        closest identity first. Identities further than the tolerance are
+        left out, so an empty list means "Unknown".
+        """
+        faces = np.asarray(face_encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        with self._lock:
+            encodings, identity, names, ann = self.encodings, self.identity, self.names, self._ann
+            sq_norms = self._sq_norms
+        if len(faces) == 0:
+            return []
+        if len(encodings) == 0:
+            return [[] for _ in faces]
+
+        if ann is not None:
+            return self._match_ann(faces, ann, encodings, identity, names, top_k)
+
+        sq = (faces ** 2).sum(axis=1)[:, None] + sq_norms[None, :] - 2.0 * faces @ encodings.T
+        dist = np.sqrt(np.maximum(sq, 0.0))                             # M×N
+
+        # Best distance per identity (several encodings may share one)
+        per_identity = np.full((len(faces), len(names)), np.inf, dtype=np.float32)
+        np.minimum.at(per_identity, (slice(None), identity), dist)      # M×I
+
+        return self._top_k(per_identity, names, top_k)
+
+    def _match_ann(self, faces, ann, encodings, identity, names, top_k):
+        k = min(len(encodings), max(ANN_CANDIDATES, top_k * 4))
+        _, candidates = ann.search(faces, k)
+        results = []
+        for face, rows in zip(faces, candidates):
+            rows = rows[rows >= 0]
+            dist = np.linalg.norm(encodings[rows] - face, axis=1)
+            best = {}
+            for row, d in zip(rows.tolist(), dist.tolist()):
+                ident = int(identity[row])
+                if d < best.get(ident, np.inf):
+                    best[ident] = d
+            ranked = sorted(best.items(), key=lambda item: item[1])[:top_k]
+            results.append([(names[ident], d) for ident, d in ranked if d <= self.tolerance])
+        return results
+
+    def _top_k(self, per_identity, names, top_k):
+        k = min(top_k, per_identity.shape[1])
+        if k < per_identity.shape[1]:
+            order = np.argpartition(per_identity, k - 1, axis=1)[:, :k]
+        else:
+            order = np.tile(np.arange(per_identity.shape[1]), (len(per_identity), 1))
+        results = []
+        for row, candidates in zip(per_identity, order):
+            candidates = candidates[np.argsort(row[candidates])]
+            results.append([(names[i], float(row[i])) for i in candidates if row[i] <= self.tolerance])
+        return results
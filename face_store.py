@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from face_index import ENCODING_SIZE
+
+FACE_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def list_face_images(folder):
+    """(name, path) for every enrolment photo in the faces folder.
+
+    faces/<Name>.jpg enrols one photo; faces/<Name>/*.jpg enrols several.
+    """
+    images = []
+    for entry in sorted(os.listdir(folder)):
+        path = os.path.join(folder, entry)
+        if os.path.isdir(path):
+            for filename in sorted(os.listdir(path)):
+                if filename.lower().endswith(FACE_IMAGE_EXTENSIONS):
+                    images.append((entry, os.path.join(path, filename)))
+        elif entry.lower().endswith(FACE_IMAGE_EXTENSIONS):
+            # Use filename without extension as name
+            images.append((os.path.splitext(entry)[0], path))
+    return images
+
+
+def encode_face_image(path):
+    """Encoding of the first face in an image, or None (runs in worker processes)"""
+    import face_recognition
+
+    image = face_recognition.load_image_file(path)
+    encodings = face_recognition.face_encodings(image)
+    if len(encodings) == 0:
+        return None
+    return np.asarray(encodings[0], dtype=np.float32)
+
+
+class FaceEncodingStore:
+    """On-disk cache of face encodings keyed by path, size and mtime.
+
+    Only new or modified photos are encoded on reload, on the face worker
+    processes when an encoder pool is given and inline otherwise; the store
+    never starts worker processes itself. Photos without a detectable face
+    are remembered too so they are not retried on every start.
+    """
+
+    def __init__(self, folder, cache_file, encoder=None):
+        self.folder = folder
+        self.cache_file = cache_file
+        self.encoder = encoder
+        self._entries = {}          # path -> (size, mtime, encoding or None)
+        self._lock = threading.Lock()
+        self._loaded = False
+
+        # Metrics
+        self.last_reload = None
+        self.last_reload_seconds = 0.0
+        self.last_encoded = 0
+        self.last_reused = 0
+        self.failed = 0
+
+    def _load_cache(self):
+        self._loaded = True
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with np.load(self.cache_file, allow_pickle=False) as data:
+                encodings = data["encodings"]
+                for path, size, mtime, has_face, encoding in zip(
+                        data["paths"].tolist(), data["sizes"].tolist(), data["mtimes"].tolist(),
+                        data["has_face"].tolist(), encodings):
+                    self._entries[path] = (size, mtime, encoding if has_face else None)
+        except Exception as e:
+            print(f"Ignoring unreadable face cache {self.cache_file}: {e}")
+            self._entries = {}
+
+    def _save_cache(self):
+        paths = sorted(self._entries)
+        encodings = np.zeros((len(paths), ENCODING_SIZE), dtype=np.float32)
+        has_face = np.zeros(len(paths), dtype=bool)
+        for i, path in enumerate(paths):
+            encoding = self._entries[path][2]
+            if encoding is not None:
+                encodings[i] = encoding
+                has_face[i] = True
+
+        # Write to a temp file first so a crash never leaves a truncated cache
+        tmp_file = self.cache_file + ".tmp.npz"
+        np.savez(tmp_file,
+                 paths=np.array(paths, dtype=str),
+                 sizes=np.array([self._entries[p][0] for p in paths], dtype=np.int64),
+                 mtimes=np.array([self._entries[p][1] for p in paths], dtype=np.float64),
+                 has_face=has_face,
+                 encodings=encodings)
+        os.replace(tmp_file, self.cache_file)
+
+    def _encode(self, paths):
+        if self.encoder is not None:
+            results = self.encoder.encode_images(paths)
+        else:
+            results = [self._encode_one(path) for path in paths]
+        self.failed += sum(1 for result in results if result is False)
+        return results
+
+    def _encode_one(self, path):
+        try:
+            return encode_face_image(path)
+        except Exception as e:
+            print(f"Error loading {path}: {e}")
+            return False
+
+    def reload(self):
+        """Bring the cache in line with the faces folder.
+
+        Returns the (name, encoding) pairs for every photo with a face.
+        """
+        with self._lock:
+            started = time.time()
+            if not self._loaded:
+                self._load_cache()
+
+            images = list_face_images(self.folder) if os.path.isdir(self.folder) else []
+            stale = []
+            current = {}
+            for name, path in images:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                current[path] = (st.st_size, st.st_mtime)
+                cached = self._entries.get(path)
+                if cached is None or cached[:2] != current[path]:
+                    stale.append(path)
+
+            encoded = self._encode(stale) if stale else []
+            for path, encoding in zip(stale, encoded):
+                if encoding is False:
+                    # Leave it out of the cache so it is retried next time
+                    self._entries.pop(path, None)
+                    continue
+                if encoding is None:
+                    print(f"No face found in: {path}")
+                self._entries[path] = (*current[path], encoding)
+
+            removed = [path for path in self._entries if path not in current]
+            for path in removed:
+                del self._entries[path]
+
+            if stale or removed or not os.path.exists(self.cache_file):
+                self._save_cache()
+
+            self.last_reload = time.time()
+            self.last_reload_seconds = self.last_reload - started
+            self.last_encoded = len(stale)
+            self.last_reused = len(current) - len(stale)
+
+            return [(name, self._entries[path][2]) for name, path in images
+                    if path in self._entries and self._entries[path][2] is not None]
+
+    def stats(self):
+        return {
+            "cached_images": len(self._entries),
+            "last_reload": self.last_reload,
+            "last_reload_ms": round(self.last_reload_seconds * 1000, 2),
+            "last_encoded": self.last_encoded,
+            "last_reused": self.last_reused,
+            "failed": self.failed
+        }
@@ -0,0 +1,124 @@
+from collections import deque
+from functools import partial
+
+UNKNOWN = "Unknown"
+
+
+class TrackIdentifier:
+    """Attach a recognized name to each tracked person.
+
+    A track is identified from a crop around its head when it first appears,
+    and the name is cached on its session. Known names are re-checked every
+    reverify_interval seconds, weak or unknown matches every
+    weak_reverify_interval seconds, and tracks whose face was not visible
+    every retry_interval seconds. At most max_per_frame crops are sent per
+    frame, newest tracks first, so a group walking in spreads the cost over
+    a few frames.
+
+    Crops are encoded on the shared FaceWorkerPool. Results come back
+    asynchronously and are merged on a later frame, unless the track has
+    ended or already holds a result from a newer frame.
+    """
+
+    def __init__(self, gallery, workers, reverify_interval=15.0, weak_reverify_interval=3.0,
+                 retry_interval=1.0, weak_distance=0.5, max_per_frame=2):
+        self.gallery = gallery
+        self.workers = workers
+        self.reverify_interval = reverify_interval
+        self.weak_reverify_interval = weak_reverify_interval
+        self.retry_interval = retry_interval
+        self.weak_distance = weak_distance
+        self.max_per_frame = max_per_frame
+        self._results = deque()       # (person_id, frame_time, encoding), filled by pool threads
+        self._pending = set()         # person IDs with a crop in flight
+
+        # Metrics
+        self.crops_submitted = 0
+        self.faces_found = 0
+        self.identified = 0
+        self.discarded = 0
+        self._staleness = deque(maxlen=200)
+
+    def due(self, session, now):
+        """Whether a session needs (re-)identifying this frame"""
+        attempted = session.get("face_attempt_at")
+        if attempted is None:
+            return True
+        if now - attempted < self.retry_interval:
+            return False
+
+        checked = session.get("face_checked_at")
+        if checked is None:
+            return True
+        distance = session.get("face_distance")
+        weak = session.get("name", UNKNOWN) == UNKNOWN or distance is None or distance > self.weak_distance
+        interval = self.weak_reverify_interval if weak else self.reverify_interval
+        return now - checked >= interval
+
+    def update(self, prepared, sessions, now):
+        """Send crops for due tracks seen in a PreparedFrame and merge finished results.
+
+        Returns how many crops were sent.
+        """
+        if len(self.gallery) == 0:
+            self._merge(sessions, now)
+            return 0
+
+        candidates = [(person_id, session) for person_id, session in sessions.items()
+                      if session["last_seen"] == now and session.get("head_box") is not None
+                      and person_id not in self._pending and self.due(session, now)]
+        # Brand-new tracks first, then whoever has waited longest
+        candidates.sort(key=lambda item: item[1].get("face_attempt_at") or float("-inf"))
+
+        sent = 0
+        for person_id, session in candidates[:self.max_per_frame]:
+            crop = prepared.face_crop(session["head_box"])
+            if crop is None:
+                session["face_attempt_at"] = now
+                continue
+            if not self.workers.submit_crop(crop, partial(self._on_result, person_id, now)):
+                break  # every worker slot is busy; try again next frame
+            self._pending.add(person_id)
+            session["face_attempt_at"] = now
+            sent += 1
+
+        self.crops_submitted += sent
+        self._merge(sessions, now)
+        return sent
+
+    def _on_result(self, person_id, frame_time, encoding):
+        self._results.append((person_id, frame_time, encoding))
+
+    def _merge(self, sessions, now):
+        while self._results:
+            person_id, frame_time, encoding = self._results.popleft()
+            self._pending.discard(person_id)
+            self._staleness.append(now - frame_time)
+
+            session = sessions.get(person_id)
+            if session is None or frame_time < session.get("face_checked_at", float("-inf")):
+                self.discarded += 1
+                continue
+            if encoding is None:
+                continue
+
+            self.faces_found += 1
+            matches = self.gallery.match(encoding[None, :])[0]
+            name, distance = matches[0] if matches else (UNKNOWN, None)
+            session["name"] = name
+            session["face_distance"] = distance
+            session["face_checked_at"] = frame_time
+            if name != UNKNOWN:
+                self.identified += 1
+
+    def stats(self):
+        staleness = list(self._staleness)
+        return {
+            "crops_submitted": self.crops_submitted,
+            "pending": len(self._pending),
+            "faces_found": self.faces_found,
+            "identified": self.identified,
+            "discarded": self.discarded,
+            "avg_staleness_ms": round(sum(staleness) / len(staleness) * 1000, 2) if staleness else 0,
+            "max_staleness_ms": round(max(staleness) * 1000, 2) if staleness else 0
+        }
@@ -0,0 +1,218 @@
+import atexit
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from face_store import encode_face_image
+
+# Utilization is measured over this many recent seconds
+UTILIZATION_WINDOW = 10.0
+
+# Set in each worker process by _init_worker
+_slot_buffers = None
+
+
+def _init_worker(slots, slot_shape):
+    global _slot_buffers
+    _slot_buffers = [np.ndarray(slot_shape, dtype=np.uint8, buffer=slot.buf) for slot in slots]
+
+
+def _ping():
+    return True
+
+
+def _encode_crop(crop):
+    """Detect and encode the largest face in an RGB crop; returns (encoding or None, seconds)"""
+    import face_recognition
+
+    started = time.perf_counter()
+    locations = face_recognition.face_locations(crop, model="hog")
+    encoding = None
+    if locations:
+        # The largest face in the crop is the one belonging to the track
+        largest = max(locations, key=lambda loc: (loc[2] - loc[0]) * (loc[1] - loc[3]))
+        encoding = np.asarray(face_recognition.face_encodings(crop, [largest])[0], dtype=np.float32)
+    return encoding, time.perf_counter() - started
+
+
+def _encode_slot(slot, height, width):
+    """Encode the crop waiting in a shared-memory slot (runs in a worker)"""
+    return _encode_crop(np.ascontiguousarray(_slot_buffers[slot][:height, :width]))
+
+
+class FaceWorkerPool:
+    """Face detection and encoding in worker processes, off the video path.
+
+    Crops are handed over through a fixed set of shared-memory slots, so only
+    a slot index crosses the process boundary and the GIL-heavy dlib work
+    never stalls a camera thread. When every slot is busy new crops are
+    refused rather than queued; the caller simply retries on a later frame.
+
+    Workers are forked (not spawned, which would re-run app.py in every
+    child), so start() must be called before the app starts its threads.
+    With workers=0 everything runs inline on the caller's thread.
+    """
+
+    def __init__(self, workers=1, slots=8, slot_shape=(160, 160, 3)):
+        self.workers = workers
+        self.slot_shape = slot_shape
+        self.slot_count = slots
+        self._slots = []
+        self._buffers = []
+        self._free = []
+        self._executor = None
+        self._lock = threading.Lock()
+        self._busy = deque()          # (finished_at, busy_seconds)
+        self.started_at = time.time()
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.images_encoded = 0
+        self._latencies = deque(maxlen=200)
+
+    def start(self):
+        if self.workers <= 0 or self._executor is not None:
+            return
+        size = int(np.prod(self.slot_shape))
+        self._slots = [shared_memory.SharedMemory(create=True, size=size) for _ in range(self.slot_count)]
+        self._buffers = [np.ndarray(self.slot_shape, dtype=np.uint8, buffer=slot.buf) for slot in self._slots]
+        self._free = list(range(self.slot_count))
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("fork"),
+                                             initializer=_init_worker,
+                                             initargs=(self._slots, self.slot_shape))
+        # Fork every worker now, while the process is still single-threaded
+        self._executor.submit(_ping).result()
+        self.started_at = time.time()
+        atexit.register(self.close)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for slot in self._slots:
+            slot.close()
+            slot.unlink()
+        self._slots = []
+
+    def submit_crop(self, rgb_crop, callback):
+        """Encode a crop in the background and call callback(encoding or None).
+
+        Returns False if every slot is busy. The callback runs on a pool
+        thread, so it should only hand the result over.
+        """
+        height, width = rgb_crop.shape[:2]
+        if height > self.slot_shape[0] or width > self.slot_shape[1]:
+            raise ValueError(f"Crop {width}x{height} does not fit a {self.slot_shape[1]}x{self.slot_shape[0]} slot")
+
+        if self._executor is None:
+            self.submitted += 1
+            self._finish(self._run_inline(rgb_crop), time.time(), callback)
+            return True
+
+        with self._lock:
+            if not self._free:
+                self.dropped += 1
+                return False
+            slot = self._free.pop()
+        self._buffers[slot][:height, :width] = rgb_crop
+
+        submitted_at = time.time()
+        self.submitted += 1
+        future = self._executor.submit(_encode_slot, slot, height, width)
+
+        def done(future):
+            with self._lock:
+                self._free.append(slot)
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Face worker failed: {e}")
+                result = None
+            self._finish(result, submitted_at, callback)
+
+        future.add_done_callback(done)
+        return True
+
+    def _run_inline(self, rgb_crop):
+        try:
+            return _encode_crop(np.ascontiguousarray(rgb_crop))
+        except Exception as e:
+            print(f"Face encoding failed: {e}")
+            return None
+
+    def _finish(self, result, submitted_at, callback):
+        now = time.time()
+        if result is None:
+            self.failed += 1
+            encoding = None
+        else:
+            encoding, busy = result
+            self.completed += 1
+            with self._lock:
+                self._busy.append((now, busy))
+        self._latencies.append(now - submitted_at)
+        callback(encoding)
+
+    def encode_images(self, paths):
+        """Encode enrolment photos; one result per path, False where loading failed.
+
+        Photos are handed to the workers a few at a time so head crops never
+        queue behind a whole reload: with one worker a crop waits for at
+        most one photo, with more workers one is always left for crops.
+        """
+        window = max(1, self.workers - 1)
+        pending = deque()
+        results = []
+        for path in paths:
+            if self._executor is None:
+                results.append(self._image_result(path, None))
+                continue
+            pending.append((path, self._executor.submit(encode_face_image, path)))
+            if len(pending) >= window:
+                results.append(self._image_result(*pending.popleft()))
+        while pending:
+            results.append(self._image_result(*pending.popleft()))
+        return results
+
+    def _image_result(self, path, future):
+        try:
+            result = future.result() if future is not None else encode_face_image(path)
+        except Exception as e:
+            print(f"Error loading {path}: {e}")
+            return False
+        self.images_encoded += 1
+        return result
+
+    def utilization(self):
+        """Share of worker time spent encoding over the last few seconds"""
+        now = time.time()
+        with self._lock:
+            while self._busy and now - self._busy[0][0] > UTILIZATION_WINDOW:
+                self._busy.popleft()
+            busy = sum(b for _, b in self._busy)
+        window = min(UTILIZATION_WINDOW, max(now - self.started_at, 1e-3))
+        return busy / (window * max(self.workers, 1))
+
+    def stats(self):
+        latencies = sorted(self._latencies)
+        return {
+            "workers": self.workers,
+            "slots_free": len(self._free) if self._executor is not None else None,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "images_encoded": self.images_encoded,
+            "utilization": round(self.utilization(), 3),
+            "avg_latency_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0,
+            "p95_latency_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else 0
+        }
@@ -0,0 +1,72 @@
+import datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Browsable tables: returned columns and the query-string filters each
+# accepts (exact match on the named column)
+HISTORY_TABLES = {
+    "alerts": {
+        "table": "phone_alerts",
+        "columns": ["id", "filename", "timestamp", "date", "type", "description", "camera_id", "person_name"],
+        "filters": {"type": "type", "person": "person_name", "camera": "camera_id"}
+    },
+    "sitting": {
+        "table": "sitting_sessions",
+        "columns": ["id", "person_id", "duration", "timestamp", "date", "camera_id", "person_name"],
+        "filters": {"person": "person_name", "camera": "camera_id"}
+    }
+}
+
+
+def encode_cursor(date, row_id):
+    return f"{date}_{row_id}"
+
+
+def decode_cursor(cursor):
+    """(date, id) from a page cursor; raises ValueError if malformed"""
+    date, sep, row_id = cursor.rpartition("_")
+    if not sep:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    datetime.datetime.strptime(date, "%Y-%m-%d")
+    return date, int(row_id)
+
+
+def query_page(conn, kind, filters=None, start=None, end=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """One page of a history table, newest first, plus the cursor for the next.
+
+    Rows are ordered by (date, id) descending and a page resumes strictly
+    after the cursor's row, so every page is an index seek instead of an
+    OFFSET scan over everything before it. Returns (rows, next_cursor),
+    next_cursor being None on the last page.
+    """
+    spec = HISTORY_TABLES[kind]
+    conditions = []
+    params = []
+    for name, value in (filters or {}).items():
+        if value is not None:
+            conditions.append(f"{spec['filters'][name]} = ?")
+            params.append(value)
+    if start:
+        conditions.append("date >= ?")
+        params.append(start)
+    if end:
+        conditions.append("date <= ?")
+        params.append(end)
+    if cursor:
+        conditions.append("(date, id) < (?, ?)")
+        params.extend(decode_cursor(cursor))
+
+    sql = f"SELECT {', '.join(spec['columns'])} FROM {spec['table']}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY date DESC, id DESC LIMIT ?"
+    # One extra row tells whether another page exists
+    params.append(limit + 1)
+
+    rows = [dict(zip(spec["columns"], row)) for row in conn.execute(sql, params)]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["date"], rows[-1]["id"])
+    return rows, next_cursor
@@ -0,0 +1,268 @@
+import collections
+import threading
+import time
+
+import numpy as np
+from ultralytics import YOLO
+
+# Weights for each model role
+MODEL_WEIGHTS = {
+    "seg": "yolov8n-seg.pt",
+    "det": "yolov8n.pt",
+    "pose": "yolov8n-pose.pt"
+}
+
+# Object model (if any) and pose model used by each pipeline.
+# Only boxes are read from the object model, so "det+pose" gives the same
+# alerts as "seg+pose" without paying for mask prototypes.
+PIPELINES = {
+    "seg+pose": ("seg", "pose"),
+    "det+pose": ("det", "pose"),
+    "pose-only": (None, "pose")
+}
+DEFAULT_PIPELINE = "seg+pose"
+
+INFERENCE_IMGSZ = 416
+
+# Batch scheduler tuning
+METRICS_WINDOW = 200
+SOURCE_IDLE_TIMEOUT = 2.0
+
+
+class FrameDetections:
+    """Model outputs for one frame, already copied to host memory once"""
+
+    def __init__(self, object_result, pose_result):
+        self.object_result = object_result
+        self.pose_result = pose_result
+
+        self.object_boxes = np.zeros((0, 4), dtype=np.float32)
+        self.object_classes = np.zeros((0,), dtype=np.int32)
+        if object_result is not None and object_result.boxes is not None and len(object_result.boxes):
+            # One device->host transfer for all boxes instead of one per box
+            self.object_boxes = object_result.boxes.xyxy.cpu().numpy()
+            self.object_classes = object_result.boxes.cls.cpu().numpy().astype(np.int32)
+
+        self.keypoints = None
+        if pose_result.keypoints is not None:
+            self.keypoints = pose_result.keypoints.data.cpu().numpy()
+
+
+class InferenceStage:
+    """Run the configured object and pose models on a frame"""
+
+    def __init__(self, pipeline=DEFAULT_PIPELINE):
+        self._models = {}
+        self._lock = threading.Lock()
+        # Load the default pipeline eagerly so the first frame is not delayed
+        self.load_pipeline(pipeline)
+
+    def load_pipeline(self, pipeline):
+        """Load every model a pipeline needs (raises if weights are missing)"""
+        for role in PIPELINES[pipeline]:
+            if role is not None:
+                self.get_model(role)
+
+    def get_model(self, role):
+        """Return the model for a role, loading it on first use"""
+        with self._lock:
+            if role not in self._models:
+                self._models[role] = YOLO(MODEL_WEIGHTS[role])
+            return self._models[role]
+
+    def run(self, frame, pipeline, conf):
+        """Run a pipeline on one frame and return FrameDetections"""
+        return self.run_batch([frame], pipeline, conf)[0]
+
+    def run_batch(self, frames, pipeline, conf):
+        """Run a pipeline on a list of frames with one call per model"""
+        object_role, pose_role = PIPELINES.get(pipeline, PIPELINES[DEFAULT_PIPELINE])
+
+        # Each model letterboxes the frames itself; nothing is shared between
+        # the two passes
+        object_results = [None] * len(frames)
+        if object_role is not None:
+            object_results = self.get_model(object_role)(
+                frames, conf=conf, verbose=False, imgsz=INFERENCE_IMGSZ, half=True)
+        pose_results = self.get_model(pose_role)(
+            frames, conf=conf, verbose=False, imgsz=INFERENCE_IMGSZ, half=True)
+
+        return [FrameDetections(obj, pose) for obj, pose in zip(object_results, pose_results)]
+
+
+class InferenceRequest:
+    """A frame waiting for inference, completed by the executor thread"""
+
+    def __init__(self, frame, pipeline, conf, source=None):
+        self.frame = frame
+        self.pipeline = pipeline
+        self.conf = conf
+        self.source = source
+        self.submitted_at = time.time()
+        self.result = None
+        self.error = None
+        self._done = threading.Event()
+
+    def set_result(self, result):
+        self.result = result
+        self._done.set()
+
+    def set_error(self, error):
+        self.error = error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class InferenceExecutor:
+    """Shared inference thread that batches frames from all cameras.
+
+    Camera workers submit frames and block on the result. A batch is
+    dispatched as soon as it reaches max_batch_size, every recently active
+    source has a frame waiting, or the oldest frame has waited max_wait
+    seconds, whichever comes first. Frames with the same pipeline and
+    confidence go into a single YOLO call and each result is routed back
+    to the request it came from.
+    """
+
+    def __init__(self, stage, max_batch_size=8, max_wait=0.010):
+        self.stage = stage
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending = []
+        self._cond = threading.Condition()
+        self._source_last_seen = {}
+
+        # Rolling metrics over the most recent batches
+        self._metrics_lock = threading.Lock()
+        self._batch_sizes = collections.deque(maxlen=METRICS_WINDOW)
+        self._queue_delays = collections.deque(maxlen=METRICS_WINDOW)
+        self._batch_latencies = collections.deque(maxlen=METRICS_WINDOW)
+        self.batches_run = 0
+        self.frames_run = 0
+
+        self._thread = threading.Thread(target=self._run, name="inference-executor", daemon=True)
+        self._thread.start()
+
+    def configure(self, max_batch_size=None, max_wait=None):
+        with self._cond:
+            if max_batch_size is not None:
+                self.max_batch_size = max(1, int(max_batch_size))
+            if max_wait is not None:
+                self.max_wait = max(0.0, float(max_wait))
+            self._cond.notify()
+
+    def submit(self, frame, pipeline, conf, source=None):
+        request = InferenceRequest(frame, pipeline, conf, source)
+        with self._cond:
+            self._pending.append(request)
+            self._source_last_seen[source] = request.submitted_at
+            self._cond.notify()
+        return request
+
+    def infer(self, frame, pipeline, conf, source=None):
+        """Submit a frame and wait for its FrameDetections"""
+        return self.submit(frame, pipeline, conf, source).wait()
+
+    def release(self, source):
+        """Mark a source idle (e.g. it is skipping frames) so batches stop waiting for it"""
+        with self._cond:
+            self._source_last_seen.pop(source, None)
+            self._cond.notify()
+
+    def _active_sources(self, now):
+        # A source that has not submitted for a while (stopped camera) should
+        # not make every batch wait for the full deadline
+        cutoff = now - SOURCE_IDLE_TIMEOUT
+        return len([t for t in self._source_last_seen.values() if t >= cutoff])
+
+    def _batch_ready(self, now):
+        if not self._pending:
+            return False
+        if len(self._pending) >= self.max_batch_size:
+            return True
+        if len({r.source for r in self._pending}) >= self._active_sources(now):
+            return True
+        return now - self._pending[0].submitted_at >= self.max_wait
+
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                now = time.time()
+                if self._batch_ready(now):
+                    break
+                if self._pending:
+                    self._cond.wait(max(0.0, self._pending[0].submitted_at + self.max_wait - now))
+                else:
+                    self._cond.wait()
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+
+            groups = {}
+            for request in batch:
+                groups.setdefault((request.pipeline, request.conf), []).append(request)
+
+            for (pipeline, conf), requests in groups.items():
+                started = time.time()
+                try:
+                    results = self.stage.run_batch([r.frame for r in requests], pipeline, conf)
+                except Exception as e:
+                    print(f"Inference error: {e}")
+                    for request in requests:
+                        request.set_error(e)
+                    continue
+                latency = time.time() - started
+
+                for request, result in zip(requests, results):
+                    request.set_result(result)
+
+                with self._metrics_lock:
+                    self.batches_run += 1
+                    self.frames_run += len(requests)
+                    self._batch_sizes.append(len(requests))
+                    self._batch_latencies.append(latency)
+                    self._queue_delays.extend(started - r.submitted_at for r in requests)
+
+    def stats(self):
+        with self._metrics_lock:
+            sizes = list(self._batch_sizes)
+            delays = list(self._queue_delays)
+            latencies = list(self._batch_latencies)
+            batches_run = self.batches_run
+            frames_run = self.frames_run
+
+        avg_size = sum(sizes) / len(sizes) if sizes else 0
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "queue_depth": len(self._pending),
+            "batches_run": batches_run,
+            "frames_run": frames_run,
+            "avg_batch_size": round(avg_size, 2),
+            "batch_fill_rate": round(avg_size / self.max_batch_size, 3) if sizes else 0,
+            "avg_queue_delay_ms": round(_mean(delays) * 1000, 2),
+            "p95_queue_delay_ms": round(_percentile(delays, 95) * 1000, 2),
+            "avg_batch_latency_ms": round(_mean(latencies) * 1000, 2),
+            "p95_batch_latency_ms": round(_percentile(latencies, 95) * 1000, 2)
+        }
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
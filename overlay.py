@@ -0,0 +1,139 @@
+import collections
+import functools
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# Timer card style
+CARD_PADDING = 20
+CARD_HEIGHT = 70
+CARD_ALPHA = 0.75
+CARD_FILL = (20, 20, 20)
+CARD_BORDER = (100, 100, 100)
+LABEL_COLOR = (150, 150, 150)
+TIMER_COLOR = (255, 255, 255)
+SPRITE_CACHE_SIZE = 512
+
+
+@functools.lru_cache(maxsize=1024)
+def text_size(text, scale, thickness):
+    """Cached cv2.getTextSize (width, height) for overlay labels"""
+    return cv2.getTextSize(text, FONT, scale, thickness)[0]
+
+
+def status_color(status):
+    # Orange for Sitting, Blue for Standing
+    return (255, 149, 0) if status.startswith("SITTING") else (0, 149, 255)
+
+
+class CardSprite:
+    """Pre-rendered timer card: blended background plus opaque text layer"""
+
+    def __init__(self, timer_text, status):
+        text_w = text_size(timer_text, 0.9, 2)[0]
+        label_w = text_size(status, 0.5, 1)[0]
+        self.card_width = max(text_w, label_w) + CARD_PADDING * 2
+
+        # One pixel margin on each side for the 2px border
+        w = self.card_width + 3
+        h = CARD_HEIGHT + 3
+        self.background = np.zeros((h, w, 3), dtype=np.uint8)
+        cv2.rectangle(self.background, (1, 1), (1 + self.card_width, 1 + CARD_HEIGHT), CARD_FILL, -1)
+        cv2.rectangle(self.background, (1, 1), (1 + self.card_width, 1 + CARD_HEIGHT), CARD_BORDER, 2)
+        self.background_mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.rectangle(self.background_mask, (1, 1), (1 + self.card_width, 1 + CARD_HEIGHT), 255, -1)
+        cv2.rectangle(self.background_mask, (1, 1), (1 + self.card_width, 1 + CARD_HEIGHT), 255, 2)
+        self.background_mask = self.background_mask.astype(bool)
+
+        # Bar and text are drawn opaque on top of the blend. Text edges are
+        # anti-aliased, so keep a coverage (alpha) layer next to the colour
+        # layer, both rendered on black (i.e. premultiplied)
+        self.foreground = np.zeros((h, w, 3), dtype=np.uint8)
+        coverage = np.zeros((h, w), dtype=np.uint8)
+        for layer, bar_color, label_color, timer_color in (
+                (self.foreground, status_color(status), LABEL_COLOR, TIMER_COLOR),
+                (coverage, 255, 255, 255)):
+            cv2.rectangle(layer, (1, 1), (1 + self.card_width, 1 + 4), bar_color, -1)
+            label_x = 1 + (self.card_width - label_w) // 2
+            cv2.putText(layer, status, (label_x, 1 + 25), FONT, 0.5, label_color, 1)
+            timer_x = 1 + (self.card_width - text_w) // 2
+            cv2.putText(layer, timer_text, (timer_x, 1 + 55), FONT, 0.9, timer_color, 2)
+        # Only ~20% of a card is text, so keep just the covered pixels
+        self.fg_ys, self.fg_xs = np.nonzero(coverage)
+        self.fg_alpha = (coverage[self.fg_ys, self.fg_xs].astype(np.float32) / 255.0)[:, None]
+        self.fg_color = self.foreground[self.fg_ys, self.fg_xs].astype(np.float32)
+        # The few pixels around the border's rounded corners are left untouched
+        self.hole_ys, self.hole_xs = np.nonzero(~self.background_mask)
+
+
+class OverlayCompositor:
+    """Draw all timer cards onto a frame in a single pass.
+
+    Cards are rendered once per (timer text, status) and cached; drawing a
+    card then only touches its own region of the frame instead of copying
+    and blending the whole image.
+    """
+
+    def __init__(self, cache_size=SPRITE_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._sprites = collections.OrderedDict()
+
+    def sprite(self, timer_text, status):
+        key = (timer_text, status)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = CardSprite(timer_text, status)
+            self._sprites[key] = sprite
+            if len(self._sprites) > self.cache_size:
+                self._sprites.popitem(last=False)
+        else:
+            self._sprites.move_to_end(key)
+        return sprite
+
+    def draw_cards(self, frame, cards):
+        """Composite (x, y, timer_text, status) cards, same layout as draw_timer_card"""
+        frame_h, frame_w = frame.shape[:2]
+        for x, y, timer_text, status in cards:
+            sprite = self.sprite(timer_text, status)
+
+            card_x = x - sprite.card_width // 2
+            card_y = y - 100
+            card_x = max(10, min(card_x, frame_w - sprite.card_width - 10))
+            card_y = max(10, card_y)
+
+            # Clip the sprite to the frame
+            x0, y0 = card_x - 1, card_y - 1
+            x1 = min(frame_w, x0 + sprite.background.shape[1])
+            y1 = min(frame_h, y0 + sprite.background.shape[0])
+            sx0, sy0 = max(0, -x0), max(0, -y0)
+            x0, y0 = max(0, x0), max(0, y0)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            sx1, sy1 = sx0 + (x1 - x0), sy0 + (y1 - y0)
+
+            clipped = sx0 or sy0 or sx1 < sprite.background.shape[1] or sy1 < sprite.background.shape[0]
+
+            # Translucent card background, blended over the ROI only
+            roi = frame[y0:y1, x0:x1]
+            bg = sprite.background[sy0:sy1, sx0:sx1]
+            blended = cv2.addWeighted(bg, CARD_ALPHA, roi, 1 - CARD_ALPHA, 0)
+            if clipped:
+                hole_ys, hole_xs = np.nonzero(~sprite.background_mask[sy0:sy1, sx0:sx1])
+            else:
+                hole_ys, hole_xs = sprite.hole_ys, sprite.hole_xs
+            kept = roi[hole_ys, hole_xs]
+            roi[:] = blended
+            roi[hole_ys, hole_xs] = kept
+
+            # Bar and text on top, weighted by their anti-aliased coverage
+            ys, xs = sprite.fg_ys, sprite.fg_xs
+            alpha, color = sprite.fg_alpha, sprite.fg_color
+            if clipped:
+                inside = (ys >= sy0) & (ys < sy1) & (xs >= sx0) & (xs < sx1)
+                ys, xs, alpha, color = ys[inside], xs[inside], alpha[inside], color[inside]
+            ys = ys - sy0
+            xs = xs - sx0
+            composed = roi[ys, xs] * (1.0 - alpha) + color
+            roi[ys, xs] = (composed + 0.5).astype(np.uint8)
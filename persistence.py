@@ -0,0 +1,208 @@
+import queue
+import sqlite3
+import threading
+import time
+
+# Indexes behind the dashboard's "latest N", per-day and history queries
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_phone_alerts_created_at ON phone_alerts (created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_phone_alerts_date ON phone_alerts (date)',
+    'CREATE INDEX IF NOT EXISTS idx_sitting_sessions_created_at ON sitting_sessions (created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_sitting_sessions_date ON sitting_sessions (date)',
+    # Filtered history pages: equality filter first, then the (date, id)
+    # keyset order (SQLite appends the rowid to every index)
+    'CREATE INDEX IF NOT EXISTS idx_phone_alerts_type_date ON phone_alerts (type, date)',
+    'CREATE INDEX IF NOT EXISTS idx_phone_alerts_person_date ON phone_alerts (person_name, date)',
+    'CREATE INDEX IF NOT EXISTS idx_phone_alerts_camera_date ON phone_alerts (camera_id, date)',
+    'CREATE INDEX IF NOT EXISTS idx_sitting_sessions_person_date ON sitting_sessions (person_name, date)',
+    'CREATE INDEX IF NOT EXISTS idx_sitting_sessions_camera_date ON sitting_sessions (camera_id, date)'
+]
+
+# Per-day rollups, kept current by triggers in the same transaction as the
+# row they count
+ROLLUP_TABLES = {
+    'daily_alerts': '''
+        CREATE TABLE daily_alerts (
+            date TEXT PRIMARY KEY,
+            alerts INTEGER NOT NULL DEFAULT 0
+        )
+    ''',
+    'daily_sitting': '''
+        CREATE TABLE daily_sitting (
+            date TEXT PRIMARY KEY,
+            sessions INTEGER NOT NULL DEFAULT 0,
+            total_duration INTEGER NOT NULL DEFAULT 0
+        )
+    '''
+}
+
+ROLLUP_BACKFILL = {
+    'daily_alerts': 'INSERT INTO daily_alerts (date, alerts) SELECT date, COUNT(*) FROM phone_alerts GROUP BY date',
+    'daily_sitting': '''
+        INSERT INTO daily_sitting (date, sessions, total_duration)
+        SELECT date, COUNT(*), SUM(duration) FROM sitting_sessions GROUP BY date
+    '''
+}
+
+ROLLUP_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_phone_alerts_insert AFTER INSERT ON phone_alerts
+    BEGIN
+        INSERT INTO daily_alerts (date, alerts) VALUES (NEW.date, 1)
+        ON CONFLICT(date) DO UPDATE SET alerts = alerts + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_phone_alerts_delete AFTER DELETE ON phone_alerts
+    BEGIN
+        UPDATE daily_alerts SET alerts = alerts - 1 WHERE date = OLD.date;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_sitting_sessions_insert AFTER INSERT ON sitting_sessions
+    BEGIN
+        INSERT INTO daily_sitting (date, sessions, total_duration) VALUES (NEW.date, 1, NEW.duration)
+        ON CONFLICT(date) DO UPDATE SET sessions = sessions + 1,
+                                        total_duration = total_duration + NEW.duration;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_sitting_sessions_delete AFTER DELETE ON sitting_sessions
+    BEGIN
+        UPDATE daily_sitting SET sessions = sessions - 1,
+                                 total_duration = total_duration - OLD.duration
+        WHERE date = OLD.date;
+    END
+    '''
+]
+
+
+def create_rollups(cursor):
+    """Add indexes, daily rollup tables and their triggers to an existing schema.
+
+    A rollup table created here for the first time is backfilled from the
+    rows already stored.
+    """
+    for sql in INDEXES:
+        cursor.execute(sql)
+    for table, sql in ROLLUP_TABLES.items():
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        if cursor.fetchone() is None:
+            cursor.execute(sql)
+            cursor.execute(ROLLUP_BACKFILL[table])
+    for sql in ROLLUP_TRIGGERS:
+        cursor.execute(sql)
+
+
+class DatabaseWriter:
+    """Background writer that batches INSERTs into one transaction.
+
+    The video path only enqueues rows; a single thread owns a persistent
+    WAL-mode connection and commits whenever the batch reaches max_batch
+    rows or the oldest queued row is flush_interval seconds old.
+    on_commit, if given, is called from the writer thread with the new
+    generation after every successful commit.
+    """
+
+    def __init__(self, database_file, max_batch=100, flush_interval=0.5, on_commit=None):
+        self.database_file = database_file
+        self.on_commit = on_commit
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # Bumped after every commit, so readers can tell when data changed
+        self.generation = 0
+
+        # Metrics
+        self.rows_written = 0
+        self.flushes = 0
+        self.errors = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, sql, params):
+        """Queue one statement; never blocks on the database"""
+        self._queue.put((sql, params))
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued before this call has been committed"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database_file)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _write(self, conn, batch):
+        if not batch:
+            return
+        started = time.time()
+        try:
+            with conn:
+                for sql, params in batch:
+                    conn.execute(sql, params)
+            self.rows_written += len(batch)
+            self.generation += 1
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"Database write failed ({len(batch)} rows dropped): {e}")
+        else:
+            if self.on_commit is not None:
+                self.on_commit(self.generation)
+        latency = time.time() - started
+        self.flushes += 1
+        self.last_flush_latency = latency
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+
+    def _run(self):
+        conn = self._connect()
+        batch = []
+        waiters = []
+        first_queued = None
+
+        while True:
+            timeout = None
+            if batch:
+                timeout = max(0.0, first_queued + self.flush_interval - time.time())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                if not batch:
+                    first_queued = time.time()
+                batch.append(item)
+
+            due = batch and (len(batch) >= self.max_batch or time.time() - first_queued >= self.flush_interval)
+            if due or waiters:
+                self._write(conn, batch)
+                batch = []
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+            "errors": self.errors,
+            "last_flush_ms": round(self.last_flush_latency * 1000, 2),
+            "max_flush_ms": round(self.max_flush_latency * 1000, 2)
+        }
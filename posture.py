@@ -0,0 +1,268 @@
+import math
+
+import numpy as np
+
+from tracker import iou_matrix
+
+# COCO keypoint indices
+NOSE = 0
+LEFT_EYE, RIGHT_EYE = 1, 2
+LEFT_EAR, RIGHT_EAR = 3, 4
+LEFT_SHOULDER, RIGHT_SHOULDER = 5, 6
+LEFT_WRIST, RIGHT_WRIST = 9, 10
+LEFT_HIP, RIGHT_HIP = 11, 12
+LEFT_KNEE, RIGHT_KNEE = 13, 14
+LEFT_ANKLE, RIGHT_ANKLE = 15, 16
+
+# Tolerance around a phone box when testing wrists
+WRIST_MARGIN = 40
+
+# Up to this many people, plain Python beats the fixed cost of the array ops
+SMALL_CROWD = 4
+
+
+def joint_angles(a, b, c):
+    """Angle at b in degrees for arrays of points a, b, c (N×2)"""
+    radians = np.arctan2(c[:, 1] - b[:, 1], c[:, 0] - b[:, 0]) - np.arctan2(a[:, 1] - b[:, 1], a[:, 0] - b[:, 0])
+    angle = np.abs(radians * 180.0 / np.pi)
+    return np.where(angle > 180.0, 360 - angle, angle)
+
+
+def person_bboxes(keypoints):
+    """Bounding boxes (N×4) over detected keypoints, plus a validity mask"""
+    xy = keypoints[:, :, :2]
+    valid = xy[:, :, 0] > 0
+    has_bbox = valid.any(axis=1)
+
+    mins = np.where(valid[:, :, None], xy, np.inf).min(axis=1)
+    maxs = np.where(valid[:, :, None], xy, -np.inf).max(axis=1)
+    bboxes = np.concatenate([mins, maxs], axis=1)
+    bboxes[~has_bbox] = 0
+    return bboxes, has_bbox
+
+
+def head_boxes(keypoints, min_size=32):
+    """Square-ish crop around each head (N×4) from the face keypoints.
+
+    The box is centred on the visible nose/eye/ear points and sized from
+    their spread or the shoulder width, whichever is larger, so it still
+    covers the whole face when only a profile is visible. Needs at least two
+    visible face points.
+    """
+    x = keypoints[:, NOSE:RIGHT_EAR + 1, 0]
+    y = keypoints[:, NOSE:RIGHT_EAR + 1, 1]
+    visible = x > 0
+    has_head = visible.sum(axis=1) >= 2
+
+    count = np.maximum(visible.sum(axis=1), 1)
+    cx = np.where(visible, x, 0).sum(axis=1) / count
+    cy = np.where(visible, y, 0).sum(axis=1) / count
+    spread = np.where(visible, x, -np.inf).max(axis=1) - np.where(visible, x, np.inf).min(axis=1)
+    spread = np.where(has_head, spread, 0)
+
+    shoulders_valid = (keypoints[:, LEFT_SHOULDER, 0] > 0) & (keypoints[:, RIGHT_SHOULDER, 0] > 0)
+    shoulder_width = np.where(shoulders_valid,
+                              np.abs(keypoints[:, LEFT_SHOULDER, 0] - keypoints[:, RIGHT_SHOULDER, 0]), 0)
+
+    size = np.maximum(np.maximum(spread * 2.0, shoulder_width * 0.6), min_size)
+    boxes = np.stack([cx - size / 2, cy - size * 0.6, cx + size / 2, cy + size * 0.6], axis=1)
+    boxes[~has_head] = 0
+    return boxes, has_head
+
+
+def heads_down(keypoints):
+    """Vectorized check_head_down for all people"""
+    x = keypoints[:, :, 0]
+    y = keypoints[:, :, 1]
+
+    visible = (x[:, [NOSE, LEFT_EYE, RIGHT_EYE, LEFT_SHOULDER, RIGHT_SHOULDER]] > 0).all(axis=1)
+    eye_y = (y[:, LEFT_EYE] + y[:, RIGHT_EYE]) / 2
+    shoulder_y = (y[:, LEFT_SHOULDER] + y[:, RIGHT_SHOULDER]) / 2
+    nose_to_eye = y[:, NOSE] - eye_y
+    eye_to_shoulder = shoulder_y - eye_y
+
+    ratio = np.divide(nose_to_eye, eye_to_shoulder, out=np.zeros_like(nose_to_eye), where=eye_to_shoulder > 0)
+    return visible & (eye_to_shoulder > 0) & (ratio > 0.3)
+
+
+def sitting_postures(keypoints):
+    """Vectorized check_sitting_advanced: (is_sitting, knee_angle) arrays"""
+    xy = keypoints[:, :, :2]
+    x = keypoints[:, :, 0]
+    y = keypoints[:, :, 1]
+    score = np.zeros(len(keypoints), dtype=np.int32)
+
+    left_valid = (x[:, [LEFT_HIP, LEFT_KNEE, LEFT_ANKLE]] > 0).all(axis=1)
+    left_angle = joint_angles(xy[:, LEFT_HIP], xy[:, LEFT_KNEE], xy[:, LEFT_ANKLE])
+    left_bent = left_valid & (left_angle > 60) & (left_angle < 120)
+
+    right_valid = (x[:, [RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE]] > 0).all(axis=1)
+    right_angle = joint_angles(xy[:, RIGHT_HIP], xy[:, RIGHT_KNEE], xy[:, RIGHT_ANKLE])
+    right_bent = right_valid & (right_angle > 60) & (right_angle < 120)
+
+    score += left_bent
+    score += right_bent
+    knee_angle = np.where(left_bent, left_angle, np.where(right_bent, right_angle, 0.0))
+
+    hip_x = (x[:, LEFT_HIP] + x[:, RIGHT_HIP]) / 2
+    hip_y = (y[:, LEFT_HIP] + y[:, RIGHT_HIP]) / 2
+
+    knees_valid = (x[:, LEFT_KNEE] > 0) & (x[:, RIGHT_KNEE] > 0)
+    hip_knee_diff = hip_y - (y[:, LEFT_KNEE] + y[:, RIGHT_KNEE]) / 2
+    score += knees_valid & (hip_knee_diff > -50) & (hip_knee_diff < 100)
+
+    torso_valid = (x[:, LEFT_SHOULDER] > 0) & (x[:, RIGHT_SHOULDER] > 0) & (hip_x > 0)
+    torso_vertical = hip_y - (y[:, LEFT_SHOULDER] + y[:, RIGHT_SHOULDER]) / 2
+    torso_horizontal = np.abs(hip_x - (x[:, LEFT_SHOULDER] + x[:, RIGHT_SHOULDER]) / 2)
+    score += torso_valid & (torso_vertical > 0) & (torso_horizontal < torso_vertical * 0.5)
+
+    is_sitting = score >= 2
+    return is_sitting, np.where(is_sitting, knee_angle, 0.0)
+
+
+def wrists_near_phones(keypoints, phone_boxes, margin=WRIST_MARGIN):
+    """Vectorized check_phone_in_hand as an N×P wrist-in-box test"""
+    phone_boxes = np.asarray(phone_boxes, dtype=np.float32).reshape(-1, 4)
+    if len(phone_boxes) == 0:
+        return np.zeros(len(keypoints), dtype=bool)
+
+    wrists = keypoints[:, [LEFT_WRIST, RIGHT_WRIST], :2]              # N×2×2
+    wx = wrists[:, :, 0][:, :, None]                                  # N×2×1
+    wy = wrists[:, :, 1][:, :, None]
+    inside = ((wx >= phone_boxes[:, 0] - margin) & (wx <= phone_boxes[:, 2] + margin) &
+              (wy >= phone_boxes[:, 1] - margin) & (wy <= phone_boxes[:, 3] + margin))  # N×2×P
+    inside &= wx > 0
+    return inside.any(axis=(1, 2))
+
+
+def _angle(ax, ay, bx, by, cx, cy):
+    angle = abs((math.atan2(cy - by, cx - bx) - math.atan2(ay - by, ax - bx)) * 180.0 / math.pi)
+    return 360 - angle if angle > 180.0 else angle
+
+
+def _iou(a, b):
+    inter = (max(0.0, min(a[2], b[2]) - max(a[0], b[0])) *
+             max(0.0, min(a[3], b[3]) - max(a[1], b[1])))
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _analyze_person(kps, phone_boxes, min_head_size=32, margin=WRIST_MARGIN):
+    """Everything analyze_postures reports for one person, from plain lists"""
+    x = [point[0] for point in kps]
+    y = [point[1] for point in kps]
+
+    valid = [i for i in range(len(kps)) if x[i] > 0]
+    if valid:
+        bbox = [min(x[i] for i in valid), min(y[i] for i in valid),
+                max(x[i] for i in valid), max(y[i] for i in valid)]
+    else:
+        bbox = [0.0, 0.0, 0.0, 0.0]
+
+    face = [i for i in range(NOSE, RIGHT_EAR + 1) if x[i] > 0]
+    shoulders_valid = x[LEFT_SHOULDER] > 0 and x[RIGHT_SHOULDER] > 0
+    head = [0.0, 0.0, 0.0, 0.0]
+    if len(face) >= 2:
+        cx = sum(x[i] for i in face) / len(face)
+        cy = sum(y[i] for i in face) / len(face)
+        spread = max(x[i] for i in face) - min(x[i] for i in face)
+        shoulder_width = abs(x[LEFT_SHOULDER] - x[RIGHT_SHOULDER]) if shoulders_valid else 0.0
+        size = max(spread * 2.0, shoulder_width * 0.6, min_head_size)
+        head = [cx - size / 2, cy - size * 0.6, cx + size / 2, cy + size * 0.6]
+
+    score = 0
+    knee_angle = 0.0
+    if x[LEFT_HIP] > 0 and x[LEFT_KNEE] > 0 and x[LEFT_ANKLE] > 0:
+        angle = _angle(x[LEFT_HIP], y[LEFT_HIP], x[LEFT_KNEE], y[LEFT_KNEE], x[LEFT_ANKLE], y[LEFT_ANKLE])
+        if 60 < angle < 120:
+            score += 1
+            knee_angle = angle
+    if x[RIGHT_HIP] > 0 and x[RIGHT_KNEE] > 0 and x[RIGHT_ANKLE] > 0:
+        angle = _angle(x[RIGHT_HIP], y[RIGHT_HIP], x[RIGHT_KNEE], y[RIGHT_KNEE], x[RIGHT_ANKLE], y[RIGHT_ANKLE])
+        if 60 < angle < 120:
+            score += 1
+            if not knee_angle:
+                knee_angle = angle
+    hip_x = (x[LEFT_HIP] + x[RIGHT_HIP]) / 2
+    hip_y = (y[LEFT_HIP] + y[RIGHT_HIP]) / 2
+    if x[LEFT_KNEE] > 0 and x[RIGHT_KNEE] > 0 and -50 < hip_y - (y[LEFT_KNEE] + y[RIGHT_KNEE]) / 2 < 100:
+        score += 1
+    if shoulders_valid and hip_x > 0:
+        torso_vertical = hip_y - (y[LEFT_SHOULDER] + y[RIGHT_SHOULDER]) / 2
+        torso_horizontal = abs(hip_x - (x[LEFT_SHOULDER] + x[RIGHT_SHOULDER]) / 2)
+        if torso_vertical > 0 and torso_horizontal < torso_vertical * 0.5:
+            score += 1
+    sitting = score >= 2
+
+    head_down = False
+    if x[NOSE] > 0 and x[LEFT_EYE] > 0 and x[RIGHT_EYE] > 0 and shoulders_valid:
+        eye_y = (y[LEFT_EYE] + y[RIGHT_EYE]) / 2
+        eye_to_shoulder = (y[LEFT_SHOULDER] + y[RIGHT_SHOULDER]) / 2 - eye_y
+        head_down = eye_to_shoulder > 0 and (y[NOSE] - eye_y) / eye_to_shoulder > 0.3
+
+    in_hand = any(x[wrist] > 0 and box[0] - margin <= x[wrist] <= box[2] + margin and
+                  box[1] - margin <= y[wrist] <= box[3] + margin
+                  for box in phone_boxes for wrist in (LEFT_WRIST, RIGHT_WRIST))
+    nearby = bool(valid) and any(_iou(bbox, box) > 0.01 for box in phone_boxes)
+
+    return bbox, bool(valid), head, len(face) >= 2, sitting, knee_angle if sitting else 0.0, head_down, in_hand, nearby
+
+
+def postures_per_person(keypoints, phone_boxes):
+    """analyze_postures one person at a time in plain Python (small crowds)"""
+    keypoints = np.asarray(keypoints, dtype=np.float32).reshape(-1, 17, 3)
+    phones = np.asarray(phone_boxes, dtype=np.float32).reshape(-1, 4).tolist()
+    rows = [_analyze_person(kps, phones) for kps in keypoints.tolist()]
+    columns = list(zip(*rows)) if rows else [[]] * 9
+    return {
+        "bboxes": np.array(columns[0], dtype=np.float32).reshape(-1, 4),
+        "has_bbox": np.array(columns[1], dtype=bool),
+        "head_boxes": np.array(columns[2], dtype=np.float32).reshape(-1, 4),
+        "has_head": np.array(columns[3], dtype=bool),
+        "sitting": np.array(columns[4], dtype=bool),
+        "knee_angle": np.array(columns[5], dtype=np.float32),
+        "head_down": np.array(columns[6], dtype=bool),
+        "phone_in_hand": np.array(columns[7], dtype=bool),
+        "phone_nearby": np.array(columns[8], dtype=bool)
+    }
+
+
+def postures_vectorized(keypoints, phone_boxes):
+    """analyze_postures for everyone at once in array ops (larger crowds)"""
+    keypoints = np.asarray(keypoints, dtype=np.float32).reshape(-1, 17, 3)
+    phone_boxes = np.asarray(phone_boxes, dtype=np.float32).reshape(-1, 4)
+
+    bboxes, has_bbox = person_bboxes(keypoints)
+    heads, has_head = head_boxes(keypoints)
+    sitting, knee_angle = sitting_postures(keypoints)
+
+    if len(phone_boxes) and len(keypoints):
+        phone_nearby = (iou_matrix(bboxes, phone_boxes) > 0.01).any(axis=1)
+    else:
+        phone_nearby = np.zeros(len(keypoints), dtype=bool)
+
+    return {
+        "bboxes": bboxes,
+        "has_bbox": has_bbox,
+        "head_boxes": heads,
+        "has_head": has_head,
+        "sitting": sitting,
+        "knee_angle": knee_angle,
+        "head_down": heads_down(keypoints),
+        "phone_in_hand": wrists_near_phones(keypoints, phone_boxes),
+        "phone_nearby": phone_nearby
+    }
+
+
+def analyze_postures(keypoints, phone_boxes):
+    """Classify every person in a frame.
+
+    keypoints is the N×17×3 array from the pose model. Returns a dict of
+    per-person arrays: bboxes/has_bbox, head_boxes/has_head,
+    sitting/knee_angle, head_down, phone_in_hand and phone_nearby (person
+    box overlaps any phone box). Up to SMALL_CROWD people (the usual desk
+    camera) are checked one by one; bigger crowds go through array ops.
+    """
+    if len(keypoints) <= SMALL_CROWD:
+        return postures_per_person(keypoints, phone_boxes)
+    return postures_vectorized(keypoints, phone_boxes)
@@ -0,0 +1,136 @@
+import cv2
+import numpy as np
+
+# Side of the square RGB head crops handed to face recognition
+FACE_CROP_SIZE = 160
+
+# low_light_mode setting: False, True or "auto"
+LOW_LIGHT_AUTO = "auto"
+
+# Auto mode switches enhancement on below LOW_LIGHT_ON mean luma and back
+# off above LOW_LIGHT_OFF; the gap stops it flickering around one threshold
+LOW_LIGHT_ON = 60.0
+LOW_LIGHT_OFF = 80.0
+BRIGHTNESS_SMOOTHING = 0.2
+
+# Brightness is measured on a nearest-neighbour thumbnail of this size
+BRIGHTNESS_PROBE_SIZE = (64, 36)
+
+
+def frame_brightness(frame):
+    """Mean luma (0-255) of the frame, estimated from a tiny thumbnail"""
+    b, g, r, _ = cv2.mean(cv2.resize(frame, BRIGHTNESS_PROBE_SIZE, interpolation=cv2.INTER_NEAREST))
+    return 0.114 * b + 0.587 * g + 0.299 * r
+
+
+class PreparedFrame:
+    """One camera frame plus everything the pipeline derives from it.
+
+    raw is the frame as captured; image is the BGR frame the models and
+    overlays work on (the low-light variant when enabled). Both stay valid
+    only until the preprocessor prepares its next frame.
+    """
+
+    def __init__(self, preprocessor, raw, image):
+        self.preprocessor = preprocessor
+        self.raw = raw
+        self.image = image
+
+    def face_crop(self, head_box):
+        """Square RGB crop (FACE_CROP_SIZE²) around a head, or None if it is too small.
+
+        The crop is written into a reused buffer, so copy it before asking
+        for the next one.
+        """
+        frame_h, frame_w = self.image.shape[:2]
+        x1, y1, x2, y2 = head_box
+        side = int(min(max(x2 - x1, y2 - y1), frame_w, frame_h))
+        if side < 16:
+            return None
+
+        # Shift the square inside the frame rather than clipping it, so the
+        # face is never stretched
+        left = int(min(max((x1 + x2 - side) / 2, 0), frame_w - side))
+        top = int(min(max((y1 + y2 - side) / 2, 0), frame_h - side))
+        region = self.image[top:top + side, left:left + side]
+        return self.preprocessor.crop_to_rgb(region)
+
+
+class FramePreprocessor:
+    """Derive every per-frame input from the raw frame exactly once.
+
+    Output arrays are allocated once per frame size and reused, so in the
+    steady state preparing a frame allocates nothing. YOLO is fed the
+    prepared BGR image directly: the Ultralytics predictor letterboxes it
+    itself, and handing it a pre-letterboxed tensor would skip the box
+    rescaling.
+    """
+
+    def __init__(self, crop_size=FACE_CROP_SIZE):
+        self.crop_size = crop_size
+        self.clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+        self._shape = None
+        self._ycrcb = None
+        self._luma = None
+        self._enhanced = None
+        self._crop_bgr = np.empty((crop_size, crop_size, 3), dtype=np.uint8)
+        self._crop_rgb = np.empty((crop_size, crop_size, 3), dtype=np.uint8)
+
+        # Auto low-light state
+        self.brightness = None
+        self.low_light_active = False
+
+    def _allocate(self, shape):
+        if self._shape == shape:
+            return
+        self._shape = shape
+        self._ycrcb = np.empty(shape, dtype=np.uint8)
+        self._luma = np.empty(shape[:2], dtype=np.uint8)
+        self._enhanced = np.empty(shape, dtype=np.uint8)
+
+    def prepare(self, frame, low_light=False):
+        """low_light is False, True or LOW_LIGHT_AUTO (enhance only dark scenes)"""
+        if low_light == LOW_LIGHT_AUTO:
+            low_light = self.needs_low_light(frame)
+        else:
+            self.low_light_active = bool(low_light)
+        image = self.enhance_low_light(frame) if low_light else frame
+        return PreparedFrame(self, frame, image)
+
+    def needs_low_light(self, frame):
+        """Track scene brightness and decide whether enhancement is needed"""
+        brightness = frame_brightness(frame)
+        if self.brightness is None:
+            self.brightness = brightness
+        else:
+            self.brightness += BRIGHTNESS_SMOOTHING * (brightness - self.brightness)
+
+        if self.low_light_active and self.brightness > LOW_LIGHT_OFF:
+            self.low_light_active = False
+        elif not self.low_light_active and self.brightness < LOW_LIGHT_ON:
+            self.low_light_active = True
+        return self.low_light_active
+
+    def enhance_low_light(self, frame):
+        """CLAHE on the luma channel only, written into the reused output buffer"""
+        self._allocate(frame.shape)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb, dst=self._ycrcb)
+        cv2.extractChannel(self._ycrcb, 0, dst=self._luma)
+        self.clahe.apply(self._luma, dst=self._luma)
+        cv2.insertChannel(self._luma, self._ycrcb, 0)
+        cv2.cvtColor(self._ycrcb, cv2.COLOR_YCrCb2BGR, dst=self._enhanced)
+        return self._enhanced
+
+    def stats(self):
+        return {
+            "low_light_active": self.low_light_active,
+            "brightness": round(self.brightness, 1) if self.brightness is not None else None
+        }
+
+    def crop_to_rgb(self, region):
+        size = (self.crop_size, self.crop_size)
+        # Small heads get enough pixels for HOG, large ones do not waste time
+        interpolation = cv2.INTER_LINEAR if region.shape[0] < self.crop_size else cv2.INTER_AREA
+        cv2.resize(region, size, dst=self._crop_bgr, interpolation=interpolation)
+        cv2.cvtColor(self._crop_bgr, cv2.COLOR_BGR2RGB, dst=self._crop_rgb)
+        return self._crop_rgb
@@ -0,0 +1,57 @@
+import hashlib
+import threading
+import time
+
+
+class ResponseCache:
+    """One serialized response shared by every client for up to ttl seconds.
+
+    The body is rebuilt when it is older than ttl or when the caller's data
+    version changed. Building happens under a lock, so a burst of pollers
+    costs a single build. Each body carries a content hash for use as an
+    ETag: a rebuild that produces the same bytes keeps the same tag.
+    """
+
+    def __init__(self, ttl=2.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._body = None
+        self._etag = None
+        self._version = None
+        self._built_at = float("-inf")
+
+        # Metrics
+        self.hits = 0
+        self.builds = 0
+        self.last_build_latency = 0.0
+
+    def get(self, version, build):
+        """(body, etag), calling build() for fresh bytes only when needed"""
+        with self._lock:
+            now = time.time()
+            if self._body is not None and self._version == version and now - self._built_at < self.ttl:
+                self.hits += 1
+                return self._body, self._etag
+
+            body = build()
+            self.last_build_latency = time.time() - now
+            self.builds += 1
+            self._body = body
+            self._etag = hashlib.sha1(body).hexdigest()
+            self._version = version
+            self._built_at = now
+            return self._body, self._etag
+
+    def invalidate(self):
+        with self._lock:
+            self._body = None
+
+    def stats(self):
+        requests = self.hits + self.builds
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "builds": self.builds,
+            "hit_rate": round(self.hits / requests, 3) if requests else 0,
+            "last_build_ms": round(self.last_build_latency * 1000, 2)
+        }
@@ -0,0 +1,101 @@
+import time
+from collections import Counter
+
+# Work levels, richest first
+LEVEL_FULL = "full"        # configured pipeline (objects + pose)
+LEVEL_POSE = "pose"        # pose model only
+LEVEL_TRACK = "track"      # no inference: previous detections, extrapolated tracks
+LEVEL_RENDER = "render"    # no inference or tracking: redraw and publish only
+LEVELS = (LEVEL_FULL, LEVEL_POSE, LEVEL_TRACK, LEVEL_RENDER)
+DETECTION_LEVELS = (LEVEL_FULL, LEVEL_POSE)
+
+# Weight of the newest sample in the per-level latency estimates
+LATENCY_SMOOTHING = 0.2
+
+# A level that has not run for this long is tried again, so the estimate
+# recovers once the load drops
+PROBE_INTERVAL = 2.0
+
+
+class FrameScheduler:
+    """Pick how much work to do on each frame to stay within a latency budget.
+
+    Latency is measured from capture to publish. For every level the
+    scheduler keeps a smoothed estimate of its processing time and picks the
+    richest level whose estimate, added to the age of the frame, fits
+    target_latency. Among the allowed levels, detection never drops below
+    min_detection_rate per second: when it is due, at least the pose model
+    runs. A caller that leaves out the detection levels (the motion gate on
+    a static scene) gets fewer detections than that.
+    """
+
+    def __init__(self, target_latency=0.1, min_detection_rate=2.0):
+        self.target_latency = target_latency
+        self.min_detection_rate = min_detection_rate
+        self.estimates = {level: None for level in LEVELS}
+        self.last_run = {level: float("-inf") for level in LEVELS}
+        self.last_detection = float("-inf")
+
+        # Metrics
+        self.level_counts = Counter()
+        self.over_budget = 0
+        self.frames = 0
+        self.last_latency = 0.0
+        self.output_fps = 0.0
+        self._last_publish = None
+
+    def configure(self, target_latency=None, min_detection_rate=None):
+        if target_latency is not None:
+            self.target_latency = max(0.001, float(target_latency))
+        if min_detection_rate is not None:
+            self.min_detection_rate = max(0.0, float(min_detection_rate))
+
+    def choose(self, frame_age, now, allowed=LEVELS):
+        """Richest allowed level that fits the remaining budget"""
+        budget = self.target_latency - frame_age
+        detection_due = (self.min_detection_rate > 0 and
+                         now - self.last_detection >= 1.0 / self.min_detection_rate)
+
+        for level in allowed:
+            estimate = self.estimates[level]
+            if estimate is None or estimate <= budget:
+                return level
+            if now - self.last_run[level] >= PROBE_INTERVAL:
+                return level
+            if detection_due and level == LEVEL_POSE:
+                return level
+        return allowed[-1]
+
+    def record(self, level, started, captured_at, now=None):
+        """Fold one frame's measured stage time and end-to-end latency in"""
+        now = time.time() if now is None else now
+        elapsed = now - started
+        estimate = self.estimates[level]
+        self.estimates[level] = elapsed if estimate is None else estimate + LATENCY_SMOOTHING * (elapsed - estimate)
+        self.last_run[level] = now
+        if level in DETECTION_LEVELS:
+            self.last_detection = now
+
+        self.frames += 1
+        self.level_counts[level] += 1
+        self.last_latency = now - captured_at
+        if self.last_latency > self.target_latency:
+            self.over_budget += 1
+
+        if self._last_publish is not None and now > self._last_publish:
+            fps = 1.0 / (now - self._last_publish)
+            self.output_fps = fps if not self.output_fps else self.output_fps + LATENCY_SMOOTHING * (fps - self.output_fps)
+        self._last_publish = now
+
+    def stats(self):
+        return {
+            "target_latency_ms": round(self.target_latency * 1000, 1),
+            "min_detection_rate": self.min_detection_rate,
+            "last_latency_ms": round(self.last_latency * 1000, 2),
+            "output_fps": round(self.output_fps, 1),
+            "over_budget_fraction": round(self.over_budget / self.frames, 3) if self.frames else 0,
+            "level_estimates_ms": {level: round(estimate * 1000, 2) if estimate is not None else None
+                                   for level, estimate in self.estimates.items()},
+            "level_fractions": {level: round(self.level_counts[level] / self.frames, 3) if self.frames else 0
+                                for level in LEVELS}
+        }
@@ -0,0 +1,108 @@
+import os
+import queue
+import threading
+
+import cv2
+
+SNAPSHOT_FORMATS = {
+    "jpeg": (".jpg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY)
+}
+
+
+class SnapshotWriter:
+    """Small pool of threads that encode and write capture snapshots.
+
+    Callers hand over their own copy of the frame and return immediately.
+    When the queue is full the snapshot is dropped rather than blocking the
+    video stream. on_written, if given, is called with the filename, the
+    bytes and the number of files written for each snapshot. A snapshot's
+    own on_done callback runs after that, once its files exist.
+    """
+
+    def __init__(self, folder, thumbnail_folder, workers=2, max_pending=8,
+                 image_format="jpeg", quality=90, thumbnail_width=320, on_written=None):
+        self.folder = folder
+        self.on_written = on_written
+        self.thumbnail_folder = thumbnail_folder
+        self.image_format = image_format
+        self.quality = quality
+        self.thumbnail_width = thumbnail_width
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._workers = [
+            threading.Thread(target=self._run, name=f"snapshot-writer-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+        # Metrics
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def configure(self, image_format=None, quality=None, thumbnail_width=None):
+        if image_format is not None:
+            if image_format not in SNAPSHOT_FORMATS:
+                raise ValueError(f"Unknown snapshot format: {image_format}")
+            self.image_format = image_format
+        if quality is not None:
+            self.quality = max(1, min(100, int(quality)))
+        if thumbnail_width is not None:
+            self.thumbnail_width = max(0, int(thumbnail_width))
+
+    @property
+    def extension(self):
+        return SNAPSHOT_FORMATS[self.image_format][0]
+
+    def submit(self, frame, filename, on_done=None):
+        """Queue a frame for writing; returns False if it had to be dropped.
+
+        on_done, if given, is called on a writer thread once the snapshot
+        and its thumbnail are on disk. It is not called if writing fails.
+        """
+        job = (frame, filename, self.image_format, self.quality, self.thumbnail_width, on_done)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            frame, filename, image_format, quality, thumbnail_width, on_done = self._queue.get()
+            params = [SNAPSHOT_FORMATS[image_format][1], quality]
+            try:
+                path = os.path.join(self.folder, filename)
+                if not cv2.imwrite(path, frame, params):
+                    raise IOError(f"could not write {filename}")
+                paths = [path]
+
+                if thumbnail_width:
+                    thumbnail = frame
+                    if frame.shape[1] > thumbnail_width:
+                        height = int(frame.shape[0] * thumbnail_width / frame.shape[1])
+                        thumbnail = cv2.resize(frame, (thumbnail_width, height), interpolation=cv2.INTER_AREA)
+                    thumbnail_path = os.path.join(self.thumbnail_folder, filename)
+                    if cv2.imwrite(thumbnail_path, thumbnail, params):
+                        paths.append(thumbnail_path)
+                self.written += 1
+                if self.on_written is not None:
+                    self.on_written(filename, sum(os.path.getsize(p) for p in paths), len(paths))
+                if on_done is not None:
+                    on_done()
+            except Exception as e:
+                self.failed += 1
+                print(f"Failed to write snapshot {filename}: {e}")
+
+    def stats(self):
+        return {
+            "format": self.image_format,
+            "quality": self.quality,
+            "thumbnail_width": self.thumbnail_width,
+            "pending": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed
+        }
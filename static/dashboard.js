@@ -21,8 +21,24 @@ function refreshData() {
     fetchDashboardStats();
 }
 
+// Optional date range from the header pickers, e.g. "start=2025-01-01&end=2025-01-31"
+function exportRange() {
+    const params = new URLSearchParams();
+    const start = document.getElementById('export-start').value;
+    const end = document.getElementById('export-end').value;
+    if (start) params.set('start', start);
+    if (end) params.set('end', end);
+    return params;
+}
+
 function exportExcel() {
-    window.location.href = '/api/export/excel';
+    window.location.href = `/api/export/excel?${exportRange()}`;
+}
+
+function exportCsv() {
+    const params = exportRange();
+    params.set('table', 'alerts');
+    window.location.href = `/api/export/csv?${params}`;
 }
 
 function fetchDashboardStats() {
@@ -68,6 +84,8 @@ function renderAlertsTable(captures) {
             <td><span class="type-badge">${capture.type}</span></td>
             <td>${capture.description || 'Phone usage detected'}</td>
             <td>
+                <img src="/captures/${capture.thumbnail || capture.filename}" class="alert-thumb" alt="" loading="lazy"
+                     onerror="if (!this.dataset.fallback) { this.dataset.fallback = '1'; this.src = '/captures/${capture.filename}'; }">
                 <button class="btn-view" onclick="viewImage('${capture.filename}', '${capture.timestamp}', '${capture.description || 'Phone usage detected'}')">
                     👁️ View
                 </button>
@@ -142,8 +160,28 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 });
 
-// Auto-refresh every 5 seconds
-setInterval(fetchDashboardStats, 5000);
+// Refresh when the server reports newly committed rows (or a reset);
+// fall back to polling every 5 seconds without SSE
+let refreshTimer = null;
+
+function scheduleRefresh() {
+    // Coalesce bursts of events into one request
+    if (refreshTimer) return;
+    refreshTimer = setTimeout(() => {
+        refreshTimer = null;
+        fetchDashboardStats();
+    }, 500);
+}
+
+if (window.EventSource) {
+    const source = new EventSource('/api/events');
+    source.addEventListener('data_changed', scheduleRefresh);
+    source.addEventListener('reset', scheduleRefresh);
+    // Catch up on anything missed while disconnected
+    source.addEventListener('open', scheduleRefresh);
+} else {
+    setInterval(fetchDashboardStats, 5000);
+}
 
 // Initial load
 fetchDashboardStats();
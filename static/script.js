@@ -1,6 +1,7 @@
 let currentMode = 'fast';
 let currentTheme = 'dark';
 let lastAlertCount = 0;
+let recentAlerts = [];
 
 function updateFps(value) {
     document.getElementById('fps-value').innerText = value;
@@ -127,25 +128,48 @@ document.addEventListener('keydown', (e) => {
     }
 });
 
+function updateStats(data) {
+    document.getElementById('stat-fps').innerText = data.fps;
+    document.getElementById('stat-sitting').innerText = data.sitting_count || 0;
+    document.getElementById('stat-alerts').innerText = data.capture_count;
+
+    // Trigger flash effect when new alert detected
+    if (data.capture_count > lastAlertCount) {
+        triggerAlertFlash();
+    }
+    lastAlertCount = data.capture_count;
+}
+
 function fetchStats() {
     fetch('/api/stats')
         .then(response => response.json())
         .then(data => {
-            document.getElementById('stat-fps').innerText = data.fps;
-            document.getElementById('stat-sitting').innerText = data.sitting_count || 0;
-            document.getElementById('stat-alerts').innerText = data.capture_count;
-
-            // Trigger flash effect when new alert detected
-            if (data.capture_count > lastAlertCount) {
-                triggerAlertFlash();
-                lastAlertCount = data.capture_count;
-            }
-
-            renderAlerts(data.captures);
+            updateStats(data);
+            recentAlerts = data.captures || [];
+            renderAlerts(recentAlerts);
         })
         .catch(error => console.error('Error:', error));
 }
 
+// Live updates are pushed by the server; fall back to polling without SSE
+function subscribeEvents() {
+    if (!window.EventSource) {
+        setInterval(fetchStats, 1000);
+        return;
+    }
+
+    const source = new EventSource('/api/events');
+    source.addEventListener('stats', (e) => updateStats(JSON.parse(e.data)));
+    source.addEventListener('alert', (e) => {
+        recentAlerts = [JSON.parse(e.data), ...recentAlerts].slice(0, 10);
+        renderAlerts(recentAlerts);
+    });
+    source.addEventListener('reset', () => {
+        recentAlerts = [];
+        renderAlerts(recentAlerts);
+    });
+}
+
 function renderAlerts(captures) {
     const container = document.getElementById('alerts-list');
 
@@ -162,7 +186,8 @@ function renderAlerts(captures) {
 
     container.innerHTML = captures.map(capture => `
         <div class="alert-card" data-id="${capture.filename}" onclick="viewImage('${capture.filename}', '${capture.timestamp}')">
-            <img src="/captures/${capture.filename}" class="alert-image" alt="Alert">
+            <img src="/captures/${capture.thumbnail || capture.filename}" class="alert-image" alt="Alert"
+                 onerror="if (!this.dataset.fallback) { this.dataset.fallback = '1'; this.src = '/captures/${capture.filename}'; }">
             <div class="alert-info">${capture.timestamp}</div>
         </div>
     `).join('');
@@ -186,14 +211,15 @@ document.addEventListener('DOMContentLoaded', () => {
             btn.innerText = '🌙';
         }
     }
-
-    // Initialize last alert count
-    fetch('/api/stats')
-        .then(response => response.json())
-        .then(data => {
-            lastAlertCount = data.capture_count;
-        });
 });
 
-setInterval(fetchStats, 1000);
-fetchStats();
+// Initial state, then live updates
+fetch('/api/stats')
+    .then(response => response.json())
+    .then(data => {
+        lastAlertCount = data.capture_count;
+        updateStats(data);
+        recentAlerts = data.captures || [];
+        renderAlerts(recentAlerts);
+    })
+    .finally(subscribeEvents);
@@ -0,0 +1,123 @@
+import threading
+
+import cv2
+
+DEFAULT_QUALITY = 70
+
+# Variants are snapped to a few tiers so the per-frame cache stays small no
+# matter what clients ask for
+WIDTH_TIERS = (320, 480, 640, 960, 1280)
+QUALITY_TIERS = (30, 50, 70, 85)
+
+
+def snap_tier(width=None, quality=None):
+    """Map a requested width/quality onto the nearest supported tier"""
+    if width is not None:
+        smaller = [w for w in WIDTH_TIERS if w <= width]
+        width = smaller[-1] if smaller else WIDTH_TIERS[0]
+    if quality is None:
+        quality = DEFAULT_QUALITY
+    quality = min(QUALITY_TIERS, key=lambda q: abs(q - quality))
+    return width, quality
+
+
+class FrameSlot:
+    """One published frame plus the multipart chunks encoded from it so far"""
+
+    def __init__(self, seq, frame):
+        self.seq = seq
+        self.frame = frame
+        self.chunks = {}
+        self.lock = threading.Lock()
+
+
+class FrameBroadcaster:
+    """Hold the latest frame and fan it out to any number of MJPEG viewers.
+
+    Frames are only encoded when a subscriber asks for them, once per frame
+    and tier; every viewer of that tier then shares the same immutable
+    bytes object. With no viewers connected nothing is encoded at all.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._slot = None
+        self._seq = 0
+        self._closed = False
+        self.subscribers = 0
+        self.encodes = 0
+
+    @property
+    def has_subscribers(self):
+        return self.subscribers > 0
+
+    def publish(self, frame):
+        """Replace the latest frame and wake up every waiting subscriber.
+
+        The frame must not be modified after it has been published.
+        """
+        with self._cond:
+            self._seq += 1
+            self._slot = FrameSlot(self._seq, frame)
+            self._cond.notify_all()
+
+    def close(self):
+        """Signal subscribers that the producer has stopped"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+
+    def wait_for_frame(self, last_seq, timeout=1.0):
+        """Block until a frame newer than last_seq is available (or timeout)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq != last_seq or self._closed, timeout)
+            return self._slot
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def encoded_chunk(self, slot, tier):
+        """Multipart chunk for a frame at a tier, encoding it on first use"""
+        with slot.lock:
+            chunk = slot.chunks.get(tier)
+            if chunk is None:
+                width, quality = tier
+                frame = slot.frame
+                if width is not None and frame.shape[1] > width:
+                    height = int(frame.shape[0] * width / frame.shape[1])
+                    frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+                ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+                chunk = (b'--frame\r\n'
+                         b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+                slot.chunks[tier] = chunk
+                self.encodes += 1
+            return chunk
+
+    def subscribe(self, width=None, quality=None):
+        """MJPEG generator for one client.
+
+        Each subscriber only ever sees the newest frame: if a client is slow,
+        intermediate frames are skipped instead of queued, so a laggy browser
+        never holds back the producer or other viewers.
+        """
+        tier = snap_tier(width, quality)
+        with self._cond:
+            self.subscribers += 1
+        last_seq = 0
+        try:
+            while True:
+                slot = self.wait_for_frame(last_seq)
+                if slot is None or slot.seq == last_seq:
+                    if self._closed:
+                        break
+                    continue
+                last_seq = slot.seq
+                yield self.encoded_chunk(slot, tier)
+        finally:
+            with self._cond:
+                self.subscribers -= 1
@@ -0,0 +1,241 @@
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+# Cost assigned to pairs that must never be matched
+INFEASIBLE = 1e6
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """IoU between every box in boxes_a (N×4) and boxes_b (M×4), as N×M"""
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+    inter_x_min = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    inter_y_min = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    inter_x_max = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    inter_y_max = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter_area = np.clip(inter_x_max - inter_x_min, 0, None) * np.clip(inter_y_max - inter_y_min, 0, None)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union_area = area_a[:, None] + area_b[None, :] - inter_area
+
+    return np.divide(inter_area, union_area, out=np.zeros_like(inter_area), where=union_area > 0)
+
+
+def centroid_distance_matrix(boxes_a, boxes_b):
+    """Euclidean distance between box centroids, as N×M"""
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+    centers_a = (boxes_a[:, :2] + boxes_a[:, 2:]) / 2
+    centers_b = (boxes_b[:, :2] + boxes_b[:, 2:]) / 2
+    diff = centers_a[:, None, :] - centers_b[None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=2))
+
+
+def match_cost_matrix(detections, tracks, iou_threshold=0.3, max_distance=200.0):
+    """Matching cost for every detection/track pair.
+
+    Pairs overlapping by more than iou_threshold cost 1 - IoU (< 1). Pairs
+    that only fall within max_distance of each other cost 1 + dist/max_distance
+    (>= 1), so an overlap match is always preferred over a distance match,
+    as in the original two-pass matcher. Everything else is infeasible.
+    """
+    iou = iou_matrix(detections, tracks)
+    dist = centroid_distance_matrix(detections, tracks)
+
+    cost = np.full(iou.shape, INFEASIBLE, dtype=np.float32)
+    near = dist < max_distance
+    cost[near] = 1.0 + dist[near] / max_distance
+    overlap = iou > iou_threshold
+    cost[overlap] = 1.0 - iou[overlap]
+    return cost
+
+
+def assign_greedy(cost):
+    """Globally greedy assignment: take the cheapest remaining pair first"""
+    if cost.size == 0:
+        return []
+
+    order = np.argsort(cost, axis=None, kind="stable")
+    rows, cols = np.unravel_index(order, cost.shape)
+    used_rows = set()
+    used_cols = set()
+    pairs = []
+    for r, c in zip(rows.tolist(), cols.tolist()):
+        if cost[r, c] >= INFEASIBLE:
+            break
+        if r in used_rows or c in used_cols:
+            continue
+        used_rows.add(r)
+        used_cols.add(c)
+        pairs.append((r, c))
+    return pairs
+
+
+def assign_hungarian(cost):
+    """Optimal assignment (requires scipy), falling back to greedy"""
+    if cost.size == 0:
+        return []
+    if linear_sum_assignment is None:
+        return assign_greedy(cost)
+
+    rows, cols = linear_sum_assignment(cost)
+    return [(r, c) for r, c in zip(rows.tolist(), cols.tolist()) if cost[r, c] < INFEASIBLE]
+
+
+ASSIGNMENT_METHODS = {
+    "greedy": assign_greedy,
+    "hungarian": assign_hungarian
+}
+
+
+class KalmanMotionModel:
+    """Constant-velocity Kalman filter on the box centre of every track.
+
+    The filters for all tracks are stacked so predict and update are a few
+    batched array operations regardless of the number of people.
+    """
+
+    def __init__(self, process_noise=50.0, measurement_noise=10.0):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.ids = []
+        self.state = np.zeros((0, 4), dtype=np.float64)      # cx, cy, vx, vy
+        self.cov = np.zeros((0, 4, 4), dtype=np.float64)
+        self.last_time = np.zeros((0,), dtype=np.float64)
+
+    def _rows(self, track_ids):
+        index = {track_id: i for i, track_id in enumerate(self.ids)}
+        return np.array([index.get(track_id, -1) for track_id in track_ids], dtype=np.int64)
+
+    def predict(self, track_ids, boxes, now):
+        """Shift each track's last box to where its filter expects it now"""
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4).copy()
+        rows = self._rows(track_ids)
+        known = rows >= 0
+        if not known.any():
+            return boxes
+
+        r = rows[known]
+        dt = (now - self.last_time[r])[:, None]
+        shift = self.state[r, 2:] * dt
+        boxes[known] += np.concatenate([shift, shift], axis=1).astype(np.float32)
+        return boxes
+
+    def velocities(self, track_ids):
+        """Estimated centre velocity (px/s) of each track, zero if unknown"""
+        rows = self._rows(track_ids)
+        velocities = np.zeros((len(rows), 2), dtype=np.float64)
+        known = rows >= 0
+        velocities[known] = self.state[rows[known], 2:]
+        return velocities
+
+    def update(self, track_ids, boxes, now):
+        """Fold the matched boxes into the filters, creating new ones as needed"""
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+
+        rows = self._rows(track_ids)
+        new = rows < 0
+        if new.any():
+            count = int(new.sum())
+            self.ids.extend(np.asarray(track_ids, dtype=object)[new].tolist())
+            init = np.zeros((count, 4))
+            init[:, :2] = centers[new]
+            self.state = np.vstack([self.state, init])
+            cov = np.tile(np.diag([self.measurement_noise, self.measurement_noise, 1e3, 1e3]), (count, 1, 1))
+            self.cov = np.concatenate([self.cov, cov])
+            self.last_time = np.concatenate([self.last_time, np.full(count, now)])
+            rows = self._rows(track_ids)
+
+        known = ~new
+        if known.any():
+            r = rows[known]
+            dt = now - self.last_time[r]
+
+            # Predict: x = F x, P = F P F^T + Q
+            F = np.tile(np.eye(4), (len(r), 1, 1))
+            F[:, 0, 2] = dt
+            F[:, 1, 3] = dt
+            x = np.einsum('nij,nj->ni', F, self.state[r])
+            P = F @ self.cov[r] @ F.transpose(0, 2, 1)
+            P += np.eye(4) * self.process_noise * np.maximum(dt, 1e-3)[:, None, None]
+
+            # Update with the measured centre (H selects cx, cy)
+            S = P[:, :2, :2] + np.eye(2) * self.measurement_noise
+            K = P[:, :, :2] @ np.linalg.inv(S)
+            innovation = centers[known] - x[:, :2]
+            x = x + np.einsum('nij,nj->ni', K, innovation)
+            P = P - K @ P[:, :2, :]
+
+            self.state[r] = x
+            self.cov[r] = P
+            self.last_time[r] = now
+
+    def prune(self, keep_ids):
+        """Forget filters for tracks that no longer exist"""
+        keep = np.array([track_id in keep_ids for track_id in self.ids], dtype=bool)
+        if keep.all():
+            return
+        self.ids = [track_id for track_id, k in zip(self.ids, keep) if k]
+        self.state = self.state[keep]
+        self.cov = self.cov[keep]
+        self.last_time = self.last_time[keep]
+
+
+class PersonTracker:
+    """Assign stable IDs to the people in a frame.
+
+    Matches all detections against the existing sessions in one shot using
+    IoU and centroid-distance matrices, then solves the assignment globally
+    so the result does not depend on detection order.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_distance=200.0, method="greedy", motion=False):
+        self.iou_threshold = iou_threshold
+        self.max_distance = max_distance
+        self.method = method
+        self.motion = motion
+        self.motion_model = KalmanMotionModel()
+        self.next_id = 0
+
+    def configure(self, method=None, motion=None):
+        if method is not None:
+            if method not in ASSIGNMENT_METHODS:
+                raise ValueError(f"Unknown tracker method: {method}")
+            self.method = method
+        if motion is not None:
+            self.motion = bool(motion)
+
+    def assign(self, boxes, person_sessions, now):
+        """Return a person ID for each box (N×4), allocating new IDs as needed"""
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        track_ids = [pid for pid, session in person_sessions.items() if 'bbox' in session]
+        track_boxes = np.array([person_sessions[pid]['bbox'] for pid in track_ids], dtype=np.float32).reshape(-1, 4)
+
+        if self.motion and len(track_ids):
+            track_boxes = self.motion_model.predict(track_ids, track_boxes, now)
+
+        cost = match_cost_matrix(boxes, track_boxes, self.iou_threshold, self.max_distance)
+        pairs = ASSIGNMENT_METHODS.get(self.method, assign_greedy)(cost)
+
+        ids = [None] * len(boxes)
+        for r, c in pairs:
+            ids[r] = track_ids[c]
+        for i in range(len(ids)):
+            if ids[i] is None:
+                ids[i] = self.next_id
+                self.next_id += 1
+
+        if self.motion:
+            if ids:
+                self.motion_model.update(ids, boxes, now)
+            self.motion_model.prune(set(track_ids) | set(ids))
+
+        return ids